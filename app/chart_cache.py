@@ -0,0 +1,72 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from singleflight import SingleFlight
+
+
+class ChartCache:
+    """Size-bounded LRU cache of rendered chart bytes keyed by (route, dataset version, params)"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(self, key, render):
+        """Return (body, etag) for a key, calling render() to produce the bytes on a miss
+
+        Concurrent misses for the same key wait for one render instead of drawing it again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        return self._flights.do(key, lambda: self._render(key, render))
+
+    def _render(self, key, render):
+        """Render and store the bytes for a key unless a render that just finished stored them"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+
+        # Render outside the lock so different charts can be drawn concurrently
+        body = render()
+        entry = (body, hashlib.sha1(body).hexdigest())
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self._size += len(body)
+                self._evict()
+        return entry
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its byte budget"""
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, (body, _) = self._entries.popitem(last=False)
+            self._size -= len(body)
+            self.evictions += 1
+
+    def stats(self):
+        """Return cache size and hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'coalesced': self._flights.shared,
+            }
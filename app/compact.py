@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Prices are stored as float32 only when rounding back to this many decimals restores every value
+PRICE_DECIMALS = 4
+
+# GS_COMPACT=0 keeps the parsed float64/int64 columns (used to measure the difference)
+COMPACT_ENABLED = os.environ.get('GS_COMPACT', '1') != '0'
+
+
+def restore_prices(values):
+    """Return exact float64 prices from a float32 or float64 column"""
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return np.round(values.astype(np.float64), PRICE_DECIMALS)
+    return values.astype(np.float64, copy=False)
+
+
+def price_array(df, column):
+    """Return one price column of a dataset frame as exact float64 values"""
+    return restore_prices(df[column].to_numpy())
+
+
+def compact_prices(values):
+    """Downcast float64 prices to float32 when that loses nothing at PRICE_DECIMALS, else return them as is"""
+    values = np.asarray(values)
+    if values.dtype != np.float64:
+        return values
+    narrow = values.astype(np.float32)
+    if np.array_equal(restore_prices(narrow), values, equal_nan=True):
+        return narrow
+    return values
+
+
+def compact_volume(values):
+    """Downcast integer volumes to int32 when every value fits"""
+    values = np.asarray(values)
+    info = np.iinfo(np.int32)
+    if values.dtype == np.int64 and (len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)):
+        return values.astype(np.int32)
+    return values
+
+
+def compact_frame(df):
+    """Return a dataset frame with prices in float32 and Volume in int32 where that is lossless
+
+    Columns that are already compact (for example memory-mapped from a snapshot) are kept
+    without a copy. With GS_COMPACT=0 compact columns are widened instead, so a snapshot
+    written in compact mode still loads as float64/int64.
+    """
+    if not COMPACT_ENABLED:
+        return expand_frame(df)
+    columns = {column: compact_prices(df[column].to_numpy()) for column in PRICE_COLUMNS}
+    columns['Volume'] = compact_volume(df['Volume'].to_numpy())
+    changed = {column: values for column, values in columns.items() if values.dtype != df[column].dtype}
+    return df.assign(**changed) if changed else df
+
+
+def match_dtypes(new_rows, df):
+    """Cast appended rows to the dtypes of the loaded frame, raising ValueError if that would lose data"""
+    cast = {}
+    for column in PRICE_COLUMNS + ['Volume']:
+        dtype = df[column].dtype
+        values = new_rows[column].to_numpy()
+        if values.dtype == dtype:
+            continue
+        narrow = values.astype(dtype)
+        restored = restore_prices(narrow) if column in PRICE_COLUMNS else narrow.astype(values.dtype)
+        if not np.array_equal(restored, values):
+            raise ValueError(f'Appended {column} values do not fit the loaded {dtype} column')
+        cast[column] = narrow
+    return new_rows.assign(**cast) if cast else new_rows
+
+
+def expand_frame(df):
+    """Return a frame with exact float64 prices and int64 Volume for output and aggregation"""
+    columns = {column: price_array(df, column) for column in PRICE_COLUMNS
+               if column in df and df[column].dtype == np.float32}
+    if 'Volume' in df and df['Volume'].dtype == np.int32:
+        columns['Volume'] = df['Volume'].to_numpy().astype(np.int64)
+    return df.assign(**columns) if columns else df
+
+
+def year_codes(dates):
+    """Calendar year of every row as int16"""
+    return pd.DatetimeIndex(dates).year.to_numpy().astype(np.int16)
@@ -0,0 +1,116 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+from compact import restore_prices
+from periods import PERIODS
+from process_pool import ProcessPool
+from store import read_dataset
+from timing import stage
+
+
+def load_ticker(file_path, periods=PERIODS):
+    """Load one ticker file and reduce it to the arrays a comparison needs
+
+    Runs in a worker process, so only NumPy arrays are returned and they cross the process
+    boundary as raw buffers rather than a pickled DataFrame: int32 epoch days and Close in
+    its stored dtype (float32 when compact) for the last row of each day, and the mean
+    volume of every period over the ticker's whole history.
+    """
+    df = read_dataset(file_path, periods)
+    days = df['Date'].to_numpy(dtype='datetime64[D]').astype(np.int32)
+    # Keep the last row of each day so files with intraday rows still give daily returns
+    last = np.append(days[1:] != days[:-1], True)
+
+    codes = df['Period'].to_numpy()
+    counts = np.bincount(codes, minlength=len(periods))
+    sums = np.bincount(codes, weights=df['Volume'].to_numpy().astype(np.float64), minlength=len(periods))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        period_volume = sums / counts
+    return {'days': days[last], 'close': df['Close'].to_numpy()[last], 'period_volume': period_volume}
+
+
+def align(tickers):
+    """Align tickers on the days they all have; returns (days, close) with one Close column per ticker"""
+    days = functools.reduce(np.intersect1d, [ticker['days'] for ticker in tickers])
+    close = np.column_stack([restore_prices(ticker['close'][np.searchsorted(ticker['days'], days)])
+                             for ticker in tickers])
+    return days, close
+
+
+def period_returns(close, codes, n_periods):
+    """Total return of every column over each period's rows, NaN for periods with fewer than two"""
+    returns = np.full((n_periods, close.shape[1]), np.nan)
+    for code in range(n_periods):
+        rows = np.flatnonzero(codes == code)
+        if len(rows) > 1:
+            returns[code] = close[rows[-1]] / close[rows[0]] - 1
+    return returns
+
+
+def finite(value):
+    """Return a float for JSON, or None for NaN and infinities"""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+@stage('compare')
+def compare(symbols, tickers, periods=PERIODS):
+    """Cross-sectional statistics of tickers loaded by load_ticker, the first symbol being the base
+
+    Returns and correlations use only the days every ticker traded. Per-period volume
+    changes use each ticker's full history and are ranked from largest to smallest.
+    """
+    days, close = align(tickers)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = close[1:] / close[:-1] - 1
+        if len(returns) > 1:
+            correlation = np.atleast_2d(np.corrcoef(returns, rowvar=False))
+        else:
+            correlation = np.full((len(symbols), len(symbols)), np.nan)
+
+        codes = periods.assign(pd.DatetimeIndex(days.astype('datetime64[D]')))
+        by_period = period_returns(close, codes, len(periods))
+        excess = by_period - by_period[:, :1]
+
+        volume = np.column_stack([ticker['period_volume'] for ticker in tickers])
+        changes = volume[1:] / volume[:-1] - 1
+
+    dates = days.astype('datetime64[D]').astype(str)
+    result = {
+        'symbols': list(symbols),
+        'base': symbols[0],
+        'days': len(days),
+        'first_date': dates[0] if len(dates) else None,
+        'last_date': dates[-1] if len(dates) else None,
+        'correlation': [[finite(value) for value in row] for row in correlation],
+        'periods': [],
+        'volume_changes': [],
+    }
+    for code, period in enumerate(periods):
+        result['periods'].append({
+            'label': period['label'],
+            'returns': {symbol: finite(value) for symbol, value in zip(symbols, by_period[code])},
+            'excess': {symbol: finite(value) for symbol, value in zip(symbols, excess[code])},
+        })
+    for code, row in enumerate(changes):
+        # Tickers without volume in either period sort last
+        order = sorted(range(len(symbols)), key=lambda i: (np.isnan(row[i]), -np.nan_to_num(row[i])))
+        result['volume_changes'].append({
+            'from': periods[code]['label'],
+            'to': periods[code + 1]['label'],
+            'ranking': [{'symbol': symbols[i], 'change': finite(row[i])} for i in order],
+        })
+    return result
+
+
+class ComparePool(ProcessPool):
+    """Load the tickers of a comparison on a pool of worker processes, or inline with max_workers=0"""
+
+    @stage('compare_load')
+    def load(self, paths):
+        """Return load_ticker(path) for every path, fanned out over the pool when it is enabled"""
+        if self.max_workers <= 0 or len(paths) < 2:
+            return [load_ticker(path) for path in paths]
+        return list(self._get_executor().map(load_ticker, paths))
@@ -0,0 +1,72 @@
+import pandas as pd
+
+from compact import expand_frame
+from ohlcv import OHLCV_COLUMNS
+from timing import stage
+
+# Statistics kept for every OHLCV column in each cube cell
+CUBE_STATS = ['mean', 'min', 'max', 'sum', 'count', 'first', 'last']
+
+# How each stored statistic combines across cells; means are recomputed from sum / count
+ROLLUP_FUNCS = {'min': 'min', 'max': 'max', 'sum': 'sum', 'count': 'sum', 'first': 'first', 'last': 'last'}
+
+
+def rollup(cells, levels):
+    """Combine finer cube cells into coarser ones (e.g. months into years) without the raw rows"""
+    spec = {(column, stat): func for column in OHLCV_COLUMNS for stat, func in ROLLUP_FUNCS.items()}
+    combined = cells.groupby(level=levels, sort=True).agg(spec)
+    for column in OHLCV_COLUMNS:
+        combined[(column, 'mean')] = combined[(column, 'sum')] / combined[(column, 'count')]
+    return combined[[(column, stat) for column in OHLCV_COLUMNS for stat in CUBE_STATS]]
+
+
+class AggregateCube:
+    """Period x year x month statistics for every OHLCV column, with yearly and period rollups"""
+
+    def __init__(self, monthly):
+        self.monthly = monthly
+        self.yearly = rollup(monthly, ['Period', 'Year'])
+        self.periods = rollup(monthly, ['Period'])
+
+    def series(self, period, column, stat='mean'):
+        """Return a yearly statistic for one period as a Series indexed by Year"""
+        if period not in self.yearly.index.get_level_values('Period'):
+            return pd.Series(dtype=float, index=pd.Index([], name='Year'))
+        return self.yearly.loc[period, (column, stat)]
+
+    def period_stat(self, period, column, stat='mean'):
+        """Return a statistic over a whole period"""
+        return self.periods.loc[period, (column, stat)]
+
+    def extend(self, new_rows):
+        """Return a cube that also covers rows appended to the dataset, merging only cube cells"""
+        cells = pd.concat([self.monthly, build_monthly(new_rows)])
+        return AggregateCube(rollup(cells, ['Period', 'Year', 'Month']))
+
+    def count(self, period):
+        """Return the number of rows in a period (0 when the dataset has none)"""
+        if period not in self.periods.index:
+            return 0
+        return int(self.periods.loc[period, ('Close', 'count')])
+
+    def years_label(self, period):
+        """Return the span of years a period covers in this dataset, e.g. '1999-2007'"""
+        years = self.series(period, 'Close').index
+        if len(years) == 0:
+            return 'n/a'
+        if years[0] == years[-1]:
+            return str(years[0])
+        return f'{years[0]}-{years[-1]}'
+
+
+@stage('groupby')
+def build_monthly(df):
+    """Aggregate a period-coded frame into period x year x month cells in a single groupby"""
+    keys = [df['Period'], df['Year'], df['Date'].dt.month.rename('Month')]
+    # Aggregate exact float64/int64 values so the cube does not depend on the storage dtypes
+    return expand_frame(df[OHLCV_COLUMNS]).groupby(keys, sort=True).agg(CUBE_STATS)
+
+
+def build_cube(df):
+    """Build the aggregate cube for a period-coded dataset frame"""
+    return AggregateCube(build_monthly(df))
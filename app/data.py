@@ -1,56 +1,430 @@
-from flask import Flask, render_template_string
-import pandas as pd
+from flask import Flask, Response, render_template_string, jsonify, request, abort, stream_with_context, g
 import os
-import matplotlib.pyplot as plt
-import io
-import base64
+import json
+import math
+import resource
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from html import escape
+from urllib.parse import urlencode
+
+from registry import SymbolRegistry
+from chart_cache import ChartCache
+from render import RenderPool
+from tables import filter_date_range, paginate, parse_date, iter_table_html
+from ohlcv import DateIndex, FORMATS, OHLCV_COLUMNS, parse_columns, select, serialize
+from cube import CUBE_STATS, build_cube
+from streaming import stream_cube
+from compare import ComparePool, compare
+from periods import PERIODS
+from indicators import build_indicators
+from downsample import METHODS, downsample_frame, points_for_width
+from metrics import METRICS, format_samples
+from profiling import RequestProfile
+from timing import stage
+from warmup import WarmupScheduler
 
 app = Flask(__name__)
 
-def load_and_process_data():
-    """Load gs.us.txt, drop OpenInt column, and create time-based dataframes"""
-    # Get the parent directory path
-    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    file_path = os.path.join(parent_dir, 'gs.us.txt')
-    
-    # Load the CSV file into a pandas dataframe
-    df = pd.read_csv(file_path)
-    
-    # Drop the OpenInt column
-    df = df.drop('OpenInt', axis=1)
-    
-    # Convert Date column to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    # Create three dataframes based on time ranges:
-    # 1. Pre-2008 Financial Crisis (1999-05-04 to 2007-12-31): Early growth period
-    df_pre_crisis = df[df['Date'] < '2008-01-01'].copy()
-    
-    # 2. Financial Crisis & Recovery (2008-01-01 to 2012-12-31): Crisis and recovery period
-    df_crisis_recovery = df[(df['Date'] >= '2008-01-01') & (df['Date'] < '2013-01-01')].copy()
-    
-    # 3. Post-Recovery Growth (2013-01-01 to 2017-11-10): Sustained growth period
-    df_post_recovery = df[df['Date'] >= '2013-01-01'].copy()
-    
-    return df, df_pre_crisis, df_crisis_recovery, df_post_recovery
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directory of Kaggle-style *.us.txt files (defaults to the repo root holding gs.us.txt)
+data_dir = os.environ.get('GS_DATA_DIR', parent_dir)
+DEFAULT_SYMBOL = 'gs'
+COMPANY_NAMES = {'gs': 'Goldman Sachs'}
+
+# Shared symbol registry: indexes every ticker file and loads datasets lazily into an LRU
+# Files over GS_STREAM_MB are aggregated from CSV chunks for the period pages instead of being loaded
+symbol_registry = SymbolRegistry(data_dir, max_bytes=int(os.environ.get('GS_CACHE_MB', 256)) * 1024 * 1024,
+                                 stream_bytes=int(os.environ.get('GS_STREAM_MB', 1024)) * 1024 * 1024)
+
+# ?profile=1 attaches a cProfile/tracemalloc report to a response; opt-in with GS_PROFILE=1
+PROFILE_ENABLED = os.environ.get('GS_PROFILE', '0') == '1'
+
+# GS_TRACE_MEMORY=1 keeps tracemalloc on so /metrics reports bytes allocated per stage (slower)
+if os.environ.get('GS_TRACE_MEMORY') == '1':
+    tracemalloc.start()
+
+@app.before_request
+def start_request_metrics():
+    """Start the request timer, and the profiler when ?profile=1 is requested"""
+    g.request_started = time.perf_counter()
+    if PROFILE_ENABLED and request.args.get('profile') == '1':
+        # A profiled response carries the report, so never answer it with 304 Not Modified
+        for header in ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE'):
+            request.environ.pop(header, None)
+        g.profile = RequestProfile().start()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record latency and response size by route, and attach the profile report if one was taken"""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    METRICS.observe('gs_request_seconds', (('route', route), ('status', response.status_code)),
+                    time.perf_counter() - g.request_started)
+    if not response.is_streamed:
+        METRICS.observe('gs_response_bytes', (('route', route),), response.calculate_content_length() or 0)
+
+    profile = g.pop('profile', None)
+    if profile is not None:
+        stages, report = profile.stop()
+        response.headers['Server-Timing'] = ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in stages.items())
+        if not response.is_streamed:
+            header = f'Profile of {request.full_path} -> {response.status} {response.mimetype}, {response.calculate_content_length()} bytes\n'
+            if response.mimetype == 'text/html':
+                # Append the report to the page itself
+                page = response.get_data(as_text=True)
+                block = f'<pre class="profile">{escape(header + report)}</pre>'
+                at = page.rfind('</body>')
+                response.set_data(page[:at] + block + page[at:] if at >= 0 else page + block)
+            else:
+                # Binary and data responses are replaced by the report, which describes them
+                response.set_data(header + report)
+                response.mimetype = 'text/plain'
+            # The body no longer matches the route's validators, and the report must not be cached
+            for validator in ('ETag', 'Last-Modified'):
+                response.headers.pop(validator, None)
+            response.headers['Cache-Control'] = 'no-store'
+    return response
+
+def get_symbol():
+    """Return the requested ?symbol= parameter, or 404 if it is not in the registry"""
+    symbol = request.args.get('symbol', DEFAULT_SYMBOL).lower()
+    if symbol not in symbol_registry:
+        abort(404, description=f'Unknown symbol: {symbol}')
+    return symbol
+
+def get_loadable_symbol():
+    """Return the requested symbol for a route that needs its whole dataset, 413 for files over GS_STREAM_MB"""
+    symbol = get_symbol()
+    if symbol_registry.streams(symbol):
+        abort(413, description=f'{symbol} is too large to load; only the period pages and /api/aggregates are available')
+    return symbol
+
+def display_name(symbol):
+    """Return a page heading name such as 'Goldman Sachs (GS)'"""
+    name = COMPANY_NAMES.get(symbol)
+    return f'{name} ({symbol.upper()})' if name else symbol.upper()
+
+def load_and_process_data(symbol=DEFAULT_SYMBOL):
+    """Load a ticker file, drop OpenInt column, and tag each row with its period code"""
+    return symbol_registry.get(symbol)
+
+# Chart rendering runs inline by default, or on GS_RENDER_WORKERS worker processes
+render_pool = RenderPool(max_workers=int(os.environ.get('GS_RENDER_WORKERS', 0)))
+
+# Ticker loads for comparisons fan out over GS_COMPARE_WORKERS processes (one per CPU by default)
+compare_pool = ComparePool(max_workers=int(os.environ.get('GS_COMPARE_WORKERS', os.cpu_count() or 1)))
+
+# Rendered chart cache shared by the PNG image routes
+chart_cache = ChartCache(max_bytes=int(os.environ.get('GS_CHART_CACHE_MB', 64)) * 1024 * 1024)
+
+def get_cube(symbol):
+    """Return the aggregate cube for a symbol, built once per dataset version"""
+    if symbol_registry.streams(symbol):
+        return symbol_registry.streamed(symbol, 'cube', stream_cube)
+    return symbol_registry.derived(symbol, 'cube', build_cube)
+
+def render_period_chart(cube, kind, column, dpi):
+    """Render a yearly-average-by-period chart for one OHLCV column as PNG bytes"""
+    # Pass plain lists so the chart can be rendered in a worker process
+    periods = []
+    for code, period in enumerate(PERIODS):
+        yearly = cube.series(code, column)
+        periods.append(dict(period, years_label=cube.years_label(code),
+                            years=[int(y) for y in yearly.index], values=[float(v) for v in yearly.values]))
+    return render_pool.render(kind, periods, dpi)
+
+@stage('html_build')
+def render_page(html_template):
+    """Render a page template string"""
+    return render_template_string(html_template)
+
+def get_indicators(symbol):
+    """Return the technical indicator set for a symbol, computed once per dataset version"""
+    return symbol_registry.derived(symbol, 'indicators', build_indicators)
+
+def get_date_index(symbol):
+    """Return the epoch-day index over a symbol's Date column, built once per dataset version"""
+    return symbol_registry.derived(symbol, 'date_index', lambda df: DateIndex(df['Date']))
+
+def downsampled_rows(symbol, series, method, width, start=None, end=None):
+    """Slice a date range and downsample it to the point budget of a chart width in pixels"""
+    lo, hi = get_date_index(symbol).locate(start, end)
+    df = load_and_process_data(symbol).iloc[lo:hi]
+    return downsample_frame(df, series, method, points_for_width(width, METHODS[method]))
+
+def parse_downsample_args():
+    """Validate the ?series=, ?method=, ?width=, ?start= and ?end= options of the downsampling routes"""
+    series = parse_columns(request.args.get('series', 'Close'))
+    if len(series) != 1:
+        raise ValueError('series must name exactly one OHLCV column')
+    method = request.args.get('method', 'lttb').lower()
+    if method not in METHODS:
+        raise ValueError(f'method must be one of: {", ".join(METHODS)}')
+    width = min(max(request.args.get('width', 1200, type=int), 200), 4000)
+    return series[0], method, width, parse_date(request.args.get('start')), parse_date(request.args.get('end'))
+
+def analysis_span(cube):
+    """Return the first and last year covered by the cube, e.g. '1999-2017'"""
+    years = cube.yearly.index.get_level_values('Year')
+    return f'{years.min()}-{years.max()}' if len(years) else 'n/a'
+
+def period_cards_html(cube, column, metric, money):
+    """Build one Bootstrap summary card per period with the average of its yearly means"""
+    cards = []
+    for code, period in enumerate(PERIODS):
+        yearly = cube.series(code, column)
+        if not cube.count(code):
+            # The ticker has no rows in this period
+            value = 'n/a'
+            extra = '<p class="card-text"><small>Range: n/a</small></p>' if money else ''
+        elif money:
+            value = f'${yearly.mean():.2f}'
+            extra = f'<p class="card-text"><small>Range: ${yearly.min():.2f} - ${yearly.max():.2f}</small></p>'
+        else:
+            value = f'{yearly.mean():,.0f}'
+            extra = ''
+        cards.append(f"""
+                    <div class="col-md">
+                        <div class="card">
+                            <div class="card-body">
+                                <h5 class="card-title">{period['label']}</h5>
+                                <p class="card-text">Years: {cube.years_label(code)}</p>
+                                <p class="card-text"><strong>{metric}:</strong> {value}</p>
+                                {extra}
+                            </div>
+                        </div>
+                    </div>""")
+    return ''.join(cards)
+
+def format_stat(value, spec):
+    """Format a statistic with a format spec, 'n/a' when it is missing or not finite"""
+    return f'{value:{spec}}' if value is not None and math.isfinite(value) else 'n/a'
+
+def period_stats_html(cube, indicators):
+    """Build one risk/return table row per period, 'n/a' for periods without rows"""
+    rows = []
+    for code, period in enumerate(PERIODS):
+        if not cube.count(code):
+            rows.append(f"<tr><td>{period['label']}</td><td>n/a</td><td>0</td>{'<td>n/a</td>' * 4}</tr>")
+            continue
+        stats = indicators.period_stats.loc[code]
+        rows.append(f"""<tr><td>{period['label']}</td><td>{cube.years_label(code)}</td><td>{int(stats['Days'])}</td>
+            <td>{format_stat(stats['AnnualReturn'], '.2%')}</td><td>{format_stat(stats['AnnualVolatility'], '.2%')}</td>
+            <td>{format_stat(stats['Sharpe'], '.2f')}</td><td>{format_stat(stats['MaxDrawdown'], '.2%')}</td></tr>""")
+    return ''.join(rows)
+
+def cached_chart(route, symbol, dpi, render, params=()):
+    """Return (body, etag, version) for a chart from the chart cache, rendering it on a miss
+
+    render is called as render(symbol, dpi); params are any other request options that change the image.
+    """
+    if symbol_registry.streams(symbol):
+        version = symbol_registry.file_version(symbol)
+    else:
+        version = symbol_registry.get_entry(symbol)[0]
+    # Key on the dataset version so a changed file never serves a stale image
+    key = (route, symbol, version, dpi) + tuple(params)
+    body, etag = chart_cache.get_or_render(key, lambda: render(symbol, dpi))
+    return body, etag, version
+
+def chart_response(route, render, params=()):
+    """Serve a cached chart PNG for the requested symbol, answering 304 when the client copy is current"""
+    symbol = get_symbol()
+    dpi = min(max(request.args.get('dpi', 100, type=int), 50), 300)
+    body, etag, version = cached_chart(route, symbol, dpi, render, params)
+
+    response = Response(body, mimetype='image/png')
+    response.set_etag(etag)
+    response.last_modified = datetime.fromtimestamp(version[0] / 1e9, tz=timezone.utc)
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/store-stats')
+def store_stats():
+    """Report dataset store and chart cache counters as JSON"""
+    stats = symbol_registry.stats()
+    stats['charts'] = chart_cache.stats()
+    return jsonify(stats)
+
+@app.route('/ready')
+def readiness():
+    """Report warm-up progress as JSON; 200 once every warmed symbol has finished, 503 before"""
+    if warmup_scheduler is None:
+        return jsonify({'ready': True, 'running': False, 'symbols': {}})
+    status = warmup_scheduler.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/metrics')
+def metrics():
+    """Expose stage/request histograms and cache and memory statistics in Prometheus text format"""
+    stats = symbol_registry.stats()
+    charts = chart_cache.stats()
+    body = [METRICS.render()]
+    for name, help_text in (('hits', 'Dataset cache hits'), ('misses', 'Dataset cache misses'),
+                            ('reloads', 'Dataset reloads after a file change'),
+                            ('appends', 'Incremental dataset appends'),
+                            ('rejected', 'Appended row batches rejected as out of date order'), ('evictions', 'Datasets evicted from the LRU')):
+        body.append(format_samples(f'gs_dataset_{name}_total', 'counter', help_text, [((), stats[name])]))
+    body.append(format_samples('gs_dataset_resident_bytes', 'gauge', 'Memory held by loaded datasets, their derived values and streamed aggregates',
+                               [((), stats['resident_bytes'])]))
+    for name, help_text in (('hits', 'Chart cache hits'), ('misses', 'Chart cache misses'),
+                            ('evictions', 'Charts evicted from the LRU')):
+        body.append(format_samples(f'gs_chart_cache_{name}_total', 'counter', help_text, [((), charts[name])]))
+    body.append(format_samples('gs_chart_cache_bytes', 'gauge', 'Memory held by cached chart images', [((), charts['bytes'])]))
+    # ru_maxrss is reported in KiB on Linux
+    body.append(format_samples('gs_process_max_rss_bytes', 'gauge', 'Peak resident set size of the process',
+                               [((), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)]))
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        body.append(format_samples('gs_traced_memory_bytes', 'gauge', 'Python heap traced by tracemalloc',
+                                   [((('kind', 'current'),), current), ((('kind', 'peak'),), peak)]))
+    return Response(''.join(body), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/ohlcv')
+def api_ohlcv():
+    """Return OHLCV rows as JSON, CSV or Arrow with date-range, column and resample options"""
+    symbol = get_loadable_symbol()
+    fmt = request.args.get('format', 'json').lower()
+    if fmt not in FORMATS:
+        abort(400, description=f'format must be one of: {", ".join(FORMATS)}')
+    try:
+        start = parse_date(request.args.get('start'))
+        end = parse_date(request.args.get('end'))
+        columns = parse_columns(request.args.get('columns'))
+        df = load_and_process_data(symbol)
+        index = get_date_index(symbol)
+        frame = select(df, index, start, end, columns, request.args.get('resample'))
+    except ValueError as e:
+        abort(400, description=str(e))
+    
+    try:
+        body = serialize(frame, fmt)
+    except ImportError:
+        abort(406, description='Arrow output requires the pyarrow package')
+    
+    if fmt == 'json':
+        body = f'{{"symbol": {json.dumps(symbol)}, "count": {len(frame)}, "data": {body}}}'
+    return Response(body, mimetype=FORMATS[fmt])
+
+@app.route('/api/aggregates')
+def api_aggregates():
+    """Return precomputed period/year/month statistics from the aggregate cube as JSON"""
+    symbol = get_symbol()
+    level = request.args.get('level', 'yearly')
+    if level not in ('monthly', 'yearly', 'period'):
+        abort(400, description='level must be one of: monthly, yearly, period')
+    stats = request.args.get('stats', 'mean').split(',')
+    if any(stat not in CUBE_STATS for stat in stats):
+        abort(400, description=f'stats must be drawn from: {", ".join(CUBE_STATS)}')
+    try:
+        columns = parse_columns(request.args.get('columns'))
+    except ValueError as e:
+        abort(400, description=str(e))
+    
+    cube = get_cube(symbol)
+    cells = {'monthly': cube.monthly, 'yearly': cube.yearly, 'period': cube.periods}[level]
+    cells = cells[[(column, stat) for column in columns for stat in stats]]
+    cells.columns = [f'{column}_{stat}' for column, stat in cells.columns]
+    return Response(cells.reset_index().to_json(orient='records'), mimetype='application/json')
+
+@app.route('/api/indicators')
+def api_indicators():
+    """Return daily technical indicator series as JSON, CSV or Arrow for a date range"""
+    symbol = get_loadable_symbol()
+    fmt = request.args.get('format', 'json').lower()
+    if fmt not in FORMATS:
+        abort(400, description=f'format must be one of: {", ".join(FORMATS)}')
+    indicators = get_indicators(symbol)
+    columns = [name for name in request.args.get('columns', '').split(',') if name] or None
+    if columns and any(name not in indicators.columns for name in columns):
+        abort(400, description=f'columns must be drawn from: {", ".join(indicators.columns)}')
+    try:
+        index = get_date_index(symbol)
+        lo, hi = index.locate(parse_date(request.args.get('start')), parse_date(request.args.get('end')))
+    except ValueError as e:
+        abort(400, description=str(e))
+    
+    frame = indicators.frame(lo, hi, columns)
+    try:
+        body = serialize(frame, fmt)
+    except ImportError:
+        abort(406, description='Arrow output requires the pyarrow package')
+    
+    if fmt == 'json':
+        # NaN warm-up values are serialized as null
+        body = f'{{"symbol": {json.dumps(symbol)}, "count": {len(frame)}, "data": {body}}}'
+    return Response(body, mimetype=FORMATS[fmt])
+
+@app.route('/symbols')
+def list_symbols():
+    """List indexed symbols with their file locations and date ranges as JSON"""
+    return jsonify({symbol: symbol_registry.info(symbol) for symbol in symbol_registry.symbols()})
+
+# Columns shown in the root table (the internal Period code column is left out)
+TABLE_COLUMNS = ['Date'] + OHLCV_COLUMNS
+
+def table_page_url(symbol, start, end, page, page_size):
+    """Build a root-view URL for a page of the (optionally date-filtered) table"""
+    params = {'symbol': symbol, 'start': start, 'end': end, 'page': page, 'page_size': page_size}
+    return '/?' + urlencode({key: value for key, value in params.items() if value})
 
 @app.route('/')
 def load_dataframe():
-    """Load gs.us.txt and display as an HTML dataframe"""
-    df, df_pre_crisis, df_crisis_recovery, df_post_recovery = load_and_process_data()
-    
-    # Convert dataframes to HTML tables
-    html_table = df.to_html(classes='table table-striped table-sm', index=False)
-    html_pre_crisis = df_pre_crisis.to_html(classes='table table-striped table-sm', index=False)
-    html_crisis_recovery = df_crisis_recovery.to_html(classes='table table-striped table-sm', index=False)
-    html_post_recovery = df_post_recovery.to_html(classes='table table-striped table-sm', index=False)
-    
-    # Create a simple HTML template
-    html_template = f"""
+    """Load a ticker file and display a page of it as an HTML dataframe"""
+    symbol = get_loadable_symbol()
+    df = load_and_process_data(symbol)
+    cube = get_cube(symbol)
+    
+    # Read pagination, date-range and streaming options
+    start = request.args.get('start', '')
+    end = request.args.get('end', '')
+    page = request.args.get('page', 1, type=int)
+    page_size = min(max(request.args.get('page_size', 100, type=int), 1), 5000)
+    stream = request.args.get('stream', '0') == '1'
+    try:
+        df_filtered = filter_date_range(df, parse_date(start), parse_date(end))
+    except ValueError:
+        abort(400, description='start and end must be dates in YYYY-MM-DD format')
+    
+    # In streaming mode the whole filtered table is sent; otherwise only the requested page
+    if stream:
+        rows, page, page_count = df_filtered, 1, 1
+    else:
+        rows, page, page_count = paginate(df_filtered, page, page_size)
+    
+    # One section per configured period, linking to the rows in its date range
+    first_date = df['Date'].min().strftime('%Y-%m-%d')
+    last_date = df['Date'].max().strftime('%Y-%m-%d')
+    period_sections = []
+    for code, period in enumerate(PERIODS):
+        period_start, period_end = PERIODS.bounds(code)
+        period_url = table_page_url(symbol, period_start, period_end, 1, page_size)
+        # Clamp the period to the data, or say so when the ticker has no rows in it
+        span = 'no data'
+        if cube.count(code):
+            span = f'{max(period_start or first_date, first_date)} to {min(period_end or last_date, last_date)}'
+        period_sections.append(f"""
+            <div class="section">
+                <h2>Period {code + 1}: {period['title']} ({span})</h2>
+                <p>Records: {cube.count(code)} | {period['description']} | <a href="{period_url}">View rows</a></p>
+            </div>
+            """)
+    period_sections = ''.join(period_sections)
+    prev_url = table_page_url(symbol, start, end, page - 1, page_size) if page > 1 else ''
+    next_url = table_page_url(symbol, start, end, page + 1, page_size) if page < page_count else ''
+    stream_url = table_page_url(symbol, start, end, None, None) + '&stream=1'
+    
+    # Create a simple HTML template; the table itself is inserted between header and footer
+    html_header = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>GS Stock Data</title>
+        <title>{symbol.upper()} Stock Data</title>
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
         <style>
             body {{ padding: 20px; }}
@@ -61,100 +435,59 @@ def load_dataframe():
     </head>
     <body>
         <div class="container">
-            <h1>Goldman Sachs (GS) Stock Data Analysis</h1>
-            <p><strong>Date Range:</strong> {df['Date'].min().strftime('%Y-%m-%d')} to {df['Date'].max().strftime('%Y-%m-%d')}</p>
+            <h1>{display_name(symbol)} Stock Data Analysis</h1>
+            <p><strong>Date Range:</strong> {first_date} to {last_date}</p>
             <p><strong>Total Records:</strong> {len(df)}</p>
             <p><em>OpenInt column removed for analysis focus</em></p>
             
+            {period_sections}
             <div class="section">
-                <h2>Complete Dataset</h2>
-                <p>Records: {len(df)}</p>
-                {html_table}
-            </div>
-            
-            <div class="section">
-                <h2>Period 1: Pre-2008 Financial Crisis (1999-05-04 to 2007-12-31)</h2>
-                <p>Records: {len(df_pre_crisis)} | Early growth and market expansion period</p>
-                {html_pre_crisis}
-            </div>
-            
-            <div class="section">
-                <h2>Period 2: Financial Crisis & Recovery (2008-01-01 to 2012-12-31)</h2>
-                <p>Records: {len(df_crisis_recovery)} | Crisis impact and recovery period</p>
-                {html_crisis_recovery}
-            </div>
-            
-            <div class="section">
-                <h2>Period 3: Post-Recovery Growth (2013-01-01 to 2017-11-10)</h2>
-                <p>Records: {len(df_post_recovery)} | Sustained growth and market recovery</p>
-                {html_post_recovery}
+                <h2>{'Complete Dataset' if not (start or end) else f'Records from {start or "start"} to {end or "end"}'}</h2>
+                <p>Records: {len(df_filtered)} | Page {page} of {page_count} | <a href="{stream_url}">Stream all rows</a></p>
+    """
+    
+    html_footer = f"""
+                <nav>
+                    {f'<a href="{prev_url}" class="btn btn-secondary btn-sm">Previous</a>' if prev_url else ''}
+                    {f'<a href="{next_url}" class="btn btn-secondary btn-sm">Next</a>' if next_url else ''}
+                </nav>
             </div>
         </div>
     </body>
     </html>
     """
     
-    return render_template_string(html_template)
+    # Stream the table as a chunked response so memory and time-to-first-byte stay flat
+    if stream:
+        def generate():
+            yield html_header
+            yield from iter_table_html(rows, TABLE_COLUMNS)
+            yield html_footer
+        return Response(stream_with_context(generate()), mimetype='text/html')
+    
+    with stage('html_build'):
+        page = html_header + ''.join(iter_table_html(rows, TABLE_COLUMNS)) + html_footer
+    return Response(page, mimetype='text/html')
+
+def render_volume_chart(symbol, dpi=100):
+    """Render the average yearly volume chart from the aggregate cube as PNG bytes"""
+    return render_period_chart(get_cube(symbol), 'volume', 'Volume', dpi)
 
 @app.route('/volume-analysis')
 def volume_analysis():
-    """Visualize average yearly volume for all three periods as a bar chart"""
-    df, df_pre_crisis, df_crisis_recovery, df_post_recovery = load_and_process_data()
-    
-    # Calculate average yearly volume for each period
-    def get_yearly_avg_volume(dataframe, period_name):
-        """Calculate average volume by year"""
-        dataframe['Year'] = dataframe['Date'].dt.year
-        yearly_volume = dataframe.groupby('Year')['Volume'].mean()
-        return yearly_volume
-    
-    yearly_pre_crisis = get_yearly_avg_volume(df_pre_crisis.copy(), 'Pre-2008')
-    yearly_crisis_recovery = get_yearly_avg_volume(df_crisis_recovery.copy(), '2008-2012')
-    yearly_post_recovery = get_yearly_avg_volume(df_post_recovery.copy(), '2013-2017')
-    
-    # Create bar chart
-    fig, axes = plt.subplots(1, 3, figsize=(16, 5))
-    fig.suptitle('Average Yearly Trading Volume by Period', fontsize=16, fontweight='bold')
-    
-    # Pre-2008 Crisis
-    axes[0].bar(yearly_pre_crisis.index, yearly_pre_crisis.values, color='#2E86AB', alpha=0.8)
-    axes[0].set_title('Pre-2008 Financial Crisis\n(1999-2007)', fontweight='bold')
-    axes[0].set_xlabel('Year')
-    axes[0].set_ylabel('Average Volume')
-    axes[0].tick_params(axis='x', rotation=45)
-    axes[0].grid(axis='y', alpha=0.3)
-    
-    # Crisis & Recovery
-    axes[1].bar(yearly_crisis_recovery.index, yearly_crisis_recovery.values, color='#A23B72', alpha=0.8)
-    axes[1].set_title('Financial Crisis & Recovery\n(2008-2012)', fontweight='bold')
-    axes[1].set_xlabel('Year')
-    axes[1].set_ylabel('Average Volume')
-    axes[1].tick_params(axis='x', rotation=45)
-    axes[1].grid(axis='y', alpha=0.3)
-    
-    # Post-Recovery Growth
-    axes[2].bar(yearly_post_recovery.index, yearly_post_recovery.values, color='#F18F01', alpha=0.8)
-    axes[2].set_title('Post-Recovery Growth\n(2013-2017)', fontweight='bold')
-    axes[2].set_xlabel('Year')
-    axes[2].set_ylabel('Average Volume')
-    axes[2].tick_params(axis='x', rotation=45)
-    axes[2].grid(axis='y', alpha=0.3)
-    
-    plt.tight_layout()
-    
-    # Convert plot to base64 image
-    img = io.BytesIO()
-    plt.savefig(img, format='png', dpi=100, bbox_inches='tight')
-    img.seek(0)
-    plot_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
+    """Visualize average yearly volume for every period as a bar chart"""
+    symbol = get_symbol()
+    cube = get_cube(symbol)
+    
+    # Summary cards for each configured period, read from the precomputed aggregate cube
+    period_cards = period_cards_html(cube, 'Volume', 'Avg Volume', money=False)
     
     # Create HTML template with chart
     html_template = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>GS Volume Analysis</title>
+        <title>{symbol.upper()} Volume Analysis</title>
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
         <style>
             body {{ padding: 20px; }}
@@ -168,47 +501,21 @@ def volume_analysis():
     <body>
         <div class="container">
             <div class="nav-links">
-                <a href="/" class="btn btn-primary btn-sm">View All Data</a>
-                <a href="/volume-analysis" class="btn btn-info btn-sm">Volume Analysis</a>
+                <a href="/?symbol={symbol}" class="btn btn-primary btn-sm">View All Data</a>
+                <a href="/volume-analysis?symbol={symbol}" class="btn btn-info btn-sm">Volume Analysis</a>
             </div>
             
-            <h1>Goldman Sachs (GS) - Average Yearly Trading Volume Analysis</h1>
-            <p><strong>Analysis Period:</strong> 1999-2017</p>
+            <h1>{display_name(symbol)} - Average Yearly Trading Volume Analysis</h1>
+            <p><strong>Analysis Period:</strong> {analysis_span(cube)}</p>
             
             <div class="chart-container">
-                <img src="data:image/png;base64,{plot_url}" alt="Average Yearly Volume Chart">
+                <img src="/volume-analysis.png?symbol={symbol}" alt="Average Yearly Volume Chart">
             </div>
             
             <div style="margin-top: 40px;">
                 <h3>Period Summary</h3>
                 <div class="row">
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Pre-2008 Crisis</h5>
-                                <p class="card-text">Years: 1999-2007</p>
-                                <p class="card-text"><strong>Avg Volume:</strong> {yearly_pre_crisis.mean():,.0f}</p>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Crisis & Recovery</h5>
-                                <p class="card-text">Years: 2008-2012</p>
-                                <p class="card-text"><strong>Avg Volume:</strong> {yearly_crisis_recovery.mean():,.0f}</p>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Post-Recovery Growth</h5>
-                                <p class="card-text">Years: 2013-2017</p>
-                                <p class="card-text"><strong>Avg Volume:</strong> {yearly_post_recovery.mean():,.0f}</p>
-                            </div>
-                        </div>
-                    </div>
+                    {period_cards}
                 </div>
             </div>
         </div>
@@ -216,57 +523,32 @@ def volume_analysis():
     </html>
     """
     
-    return render_template_string(html_template)
+    return render_page(html_template)
+
+@app.route('/volume-analysis.png')
+def volume_chart():
+    """Serve the cached volume-analysis chart image with ETag/Last-Modified validation"""
+    return chart_response('volume-analysis', render_volume_chart)
+
+def render_open_chart(symbol, dpi=100):
+    """Render the yearly average open price chart from the aggregate cube as PNG bytes"""
+    return render_period_chart(get_cube(symbol), 'open', 'Open', dpi)
 
 @app.route('/price-analysis')
 def price_analysis():
-    """Visualize yearly average open price for all three periods as a line chart"""
-    df, df_pre_crisis, df_crisis_recovery, df_post_recovery = load_and_process_data()
-    
-    # Calculate average yearly open price for each period
-    def get_yearly_avg_open_price(dataframe, period_name):
-        """Calculate average open price by year"""
-        dataframe['Year'] = dataframe['Date'].dt.year
-        yearly_open_price = dataframe.groupby('Year')['Open'].mean()
-        return yearly_open_price
-    
-    yearly_open_pre_crisis = get_yearly_avg_open_price(df_pre_crisis.copy(), 'Pre-2008')
-    yearly_open_crisis_recovery = get_yearly_avg_open_price(df_crisis_recovery.copy(), '2008-2012')
-    yearly_open_post_recovery = get_yearly_avg_open_price(df_post_recovery.copy(), '2013-2017')
-    
-    # Create line chart with all three periods on one plot for comparison
-    fig, ax = plt.subplots(figsize=(14, 7))
-    fig.suptitle('Yearly Average Opening Price Trends by Period', fontsize=16, fontweight='bold')
-    
-    # Plot lines for each period
-    ax.plot(yearly_open_pre_crisis.index, yearly_open_pre_crisis.values, marker='o', 
-            linewidth=2.5, markersize=8, label='Pre-2008 Crisis (1999-2007)', color='#2E86AB')
-    ax.plot(yearly_open_crisis_recovery.index, yearly_open_crisis_recovery.values, marker='s', 
-            linewidth=2.5, markersize=8, label='Crisis & Recovery (2008-2012)', color='#A23B72')
-    ax.plot(yearly_open_post_recovery.index, yearly_open_post_recovery.values, marker='^', 
-            linewidth=2.5, markersize=8, label='Post-Recovery Growth (2013-2017)', color='#F18F01')
-    
-    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Average Opening Price ($)', fontsize=12, fontweight='bold')
-    ax.legend(loc='best', fontsize=11)
-    ax.grid(True, alpha=0.3)
-    ax.tick_params(axis='x', rotation=45)
-    
-    plt.tight_layout()
-    
-    # Convert plot to base64 image
-    img = io.BytesIO()
-    plt.savefig(img, format='png', dpi=100, bbox_inches='tight')
-    img.seek(0)
-    plot_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
+    """Visualize yearly average open price for every period as a line chart"""
+    symbol = get_symbol()
+    cube = get_cube(symbol)
+    
+    # Summary cards for each configured period, read from the precomputed aggregate cube
+    period_cards = period_cards_html(cube, 'Open', 'Avg Open Price', money=True)
     
     # Create HTML template with chart
     html_template = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>GS Price Analysis</title>
+        <title>{symbol.upper()} Price Analysis</title>
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
         <style>
             body {{ padding: 20px; }}
@@ -280,51 +562,22 @@ def price_analysis():
     <body>
         <div class="container">
             <div class="nav-links">
-                <a href="/" class="btn btn-primary btn-sm">View All Data</a>
-                <a href="/volume-analysis" class="btn btn-info btn-sm">Volume Analysis</a>
-                <a href="/price-analysis" class="btn btn-success btn-sm">Price Analysis</a>
+                <a href="/?symbol={symbol}" class="btn btn-primary btn-sm">View All Data</a>
+                <a href="/volume-analysis?symbol={symbol}" class="btn btn-info btn-sm">Volume Analysis</a>
+                <a href="/price-analysis?symbol={symbol}" class="btn btn-success btn-sm">Price Analysis</a>
             </div>
             
-            <h1>Goldman Sachs (GS) - Yearly Average Opening Price Analysis</h1>
-            <p><strong>Analysis Period:</strong> 1999-2017</p>
+            <h1>{display_name(symbol)} - Yearly Average Opening Price Analysis</h1>
+            <p><strong>Analysis Period:</strong> {analysis_span(cube)}</p>
             
             <div class="chart-container">
-                <img src="data:image/png;base64,{plot_url}" alt="Yearly Average Opening Price Chart">
+                <img src="/price-analysis.png?symbol={symbol}" alt="Yearly Average Opening Price Chart">
             </div>
             
             <div style="margin-top: 40px;">
                 <h3>Period Summary</h3>
                 <div class="row">
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Pre-2008 Crisis</h5>
-                                <p class="card-text">Years: 1999-2007</p>
-                                <p class="card-text"><strong>Avg Open Price:</strong> ${yearly_open_pre_crisis.mean():.2f}</p>
-                                <p class="card-text"><small>Range: ${yearly_open_pre_crisis.min():.2f} - ${yearly_open_pre_crisis.max():.2f}</small></p>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Crisis & Recovery</h5>
-                                <p class="card-text">Years: 2008-2012</p>
-                                <p class="card-text"><strong>Avg Open Price:</strong> ${yearly_open_crisis_recovery.mean():.2f}</p>
-                                <p class="card-text"><small>Range: ${yearly_open_crisis_recovery.min():.2f} - ${yearly_open_crisis_recovery.max():.2f}</small></p>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Post-Recovery Growth</h5>
-                                <p class="card-text">Years: 2013-2017</p>
-                                <p class="card-text"><strong>Avg Open Price:</strong> ${yearly_open_post_recovery.mean():.2f}</p>
-                                <p class="card-text"><small>Range: ${yearly_open_post_recovery.min():.2f} - ${yearly_open_post_recovery.max():.2f}</small></p>
-                            </div>
-                        </div>
-                    </div>
+                    {period_cards}
                 </div>
             </div>
         </div>
@@ -332,57 +585,32 @@ def price_analysis():
     </html>
     """
     
-    return render_template_string(html_template)
+    return render_page(html_template)
+
+@app.route('/price-analysis.png')
+def price_chart():
+    """Serve the cached price-analysis chart image with ETag/Last-Modified validation"""
+    return chart_response('price-analysis', render_open_chart)
+
+def render_close_chart(symbol, dpi=100):
+    """Render the yearly average close price chart from the aggregate cube as PNG bytes"""
+    return render_period_chart(get_cube(symbol), 'close', 'Close', dpi)
 
 @app.route('/close-analysis')
 def close_analysis():
-    """Visualize yearly average close price for all three periods as a line chart"""
-    df, df_pre_crisis, df_crisis_recovery, df_post_recovery = load_and_process_data()
-    
-    # Calculate average yearly close price for each period
-    def get_yearly_avg_close_price(dataframe, period_name):
-        """Calculate average close price by year"""
-        dataframe['Year'] = dataframe['Date'].dt.year
-        yearly_close_price = dataframe.groupby('Year')['Close'].mean()
-        return yearly_close_price
-    
-    yearly_close_pre_crisis = get_yearly_avg_close_price(df_pre_crisis.copy(), 'Pre-2008')
-    yearly_close_crisis_recovery = get_yearly_avg_close_price(df_crisis_recovery.copy(), '2008-2012')
-    yearly_close_post_recovery = get_yearly_avg_close_price(df_post_recovery.copy(), '2013-2017')
-    
-    # Create line chart with all three periods on one plot for comparison
-    fig, ax = plt.subplots(figsize=(14, 7))
-    fig.suptitle('Yearly Average Closing Price Trends by Period', fontsize=16, fontweight='bold')
-    
-    # Plot lines for each period
-    ax.plot(yearly_close_pre_crisis.index, yearly_close_pre_crisis.values, marker='o', 
-            linewidth=2.5, markersize=8, label='Pre-2008 Crisis (1999-2007)', color='#2E86AB')
-    ax.plot(yearly_close_crisis_recovery.index, yearly_close_crisis_recovery.values, marker='s', 
-            linewidth=2.5, markersize=8, label='Crisis & Recovery (2008-2012)', color='#A23B72')
-    ax.plot(yearly_close_post_recovery.index, yearly_close_post_recovery.values, marker='^', 
-            linewidth=2.5, markersize=8, label='Post-Recovery Growth (2013-2017)', color='#F18F01')
-    
-    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Average Closing Price ($)', fontsize=12, fontweight='bold')
-    ax.legend(loc='best', fontsize=11)
-    ax.grid(True, alpha=0.3)
-    ax.tick_params(axis='x', rotation=45)
-    
-    plt.tight_layout()
-    
-    # Convert plot to base64 image
-    img = io.BytesIO()
-    plt.savefig(img, format='png', dpi=100, bbox_inches='tight')
-    img.seek(0)
-    plot_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
+    """Visualize yearly average close price for every period as a line chart"""
+    symbol = get_symbol()
+    cube = get_cube(symbol)
+    
+    # Summary cards for each configured period, read from the precomputed aggregate cube
+    period_cards = period_cards_html(cube, 'Close', 'Avg Close Price', money=True)
     
     # Create HTML template with chart
     html_template = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>GS Close Price Analysis</title>
+        <title>{symbol.upper()} Close Price Analysis</title>
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
         <style>
             body {{ padding: 20px; }}
@@ -396,52 +624,23 @@ def close_analysis():
     <body>
         <div class="container">
             <div class="nav-links">
-                <a href="/" class="btn btn-primary btn-sm">View All Data</a>
-                <a href="/volume-analysis" class="btn btn-info btn-sm">Volume Analysis</a>
-                <a href="/price-analysis" class="btn btn-success btn-sm">Price Analysis</a>
-                <a href="/close-analysis" class="btn btn-warning btn-sm">Close Price Analysis</a>
+                <a href="/?symbol={symbol}" class="btn btn-primary btn-sm">View All Data</a>
+                <a href="/volume-analysis?symbol={symbol}" class="btn btn-info btn-sm">Volume Analysis</a>
+                <a href="/price-analysis?symbol={symbol}" class="btn btn-success btn-sm">Price Analysis</a>
+                <a href="/close-analysis?symbol={symbol}" class="btn btn-warning btn-sm">Close Price Analysis</a>
             </div>
             
-            <h1>Goldman Sachs (GS) - Yearly Average Closing Price Analysis</h1>
-            <p><strong>Analysis Period:</strong> 1999-2017</p>
+            <h1>{display_name(symbol)} - Yearly Average Closing Price Analysis</h1>
+            <p><strong>Analysis Period:</strong> {analysis_span(cube)}</p>
             
             <div class="chart-container">
-                <img src="data:image/png;base64,{plot_url}" alt="Yearly Average Closing Price Chart">
+                <img src="/close-analysis.png?symbol={symbol}" alt="Yearly Average Closing Price Chart">
             </div>
             
             <div style="margin-top: 40px;">
                 <h3>Period Summary</h3>
                 <div class="row">
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Pre-2008 Crisis</h5>
-                                <p class="card-text">Years: 1999-2007</p>
-                                <p class="card-text"><strong>Avg Close Price:</strong> ${yearly_close_pre_crisis.mean():.2f}</p>
-                                <p class="card-text"><small>Range: ${yearly_close_pre_crisis.min():.2f} - ${yearly_close_pre_crisis.max():.2f}</small></p>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Crisis & Recovery</h5>
-                                <p class="card-text">Years: 2008-2012</p>
-                                <p class="card-text"><strong>Avg Close Price:</strong> ${yearly_close_crisis_recovery.mean():.2f}</p>
-                                <p class="card-text"><small>Range: ${yearly_close_crisis_recovery.min():.2f} - ${yearly_close_crisis_recovery.max():.2f}</small></p>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="card-title">Post-Recovery Growth</h5>
-                                <p class="card-text">Years: 2013-2017</p>
-                                <p class="card-text"><strong>Avg Close Price:</strong> ${yearly_close_post_recovery.mean():.2f}</p>
-                                <p class="card-text"><small>Range: ${yearly_close_post_recovery.min():.2f} - ${yearly_close_post_recovery.max():.2f}</small></p>
-                            </div>
-                        </div>
-                    </div>
+                    {period_cards}
                 </div>
             </div>
         </div>
@@ -449,5 +648,375 @@ def close_analysis():
     </html>
     """
     
-    return render_template_string(html_template)
+    return render_page(html_template)
+
+@app.route('/close-analysis.png')
+def close_chart():
+    """Serve the cached close-analysis chart image with ETag/Last-Modified validation"""
+    return chart_response('close-analysis', render_close_chart)
+
+@app.route('/indicators')
+def indicators_analysis():
+    """Show the latest technical indicators and per-period risk/return statistics"""
+    symbol = get_loadable_symbol()
+    cube = get_cube(symbol)
+    indicators = get_indicators(symbol)
+    
+    # Latest value of every indicator; windows longer than the ticker's history show n/a
+    latest_rows = ''.join(
+        f"<tr><td>{name}</td><td>{format_stat(value, '.2%' if name.startswith(('Volatility', 'Drawdown')) else ',.2f')}</td></tr>"
+        for name, value in indicators.latest().items()
+    )
+    
+    # Risk/return statistics for each configured period
+    period_rows = period_stats_html(cube, indicators)
+    
+    # Create HTML template with indicator tables
+    html_template = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{symbol.upper()} Technical Indicators</title>
+        <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
+        <style>
+            body {{ padding: 20px; }}
+            .container {{ max-width: 1400px; }}
+            .section {{ margin-top: 40px; }}
+            .nav-links {{ margin-bottom: 20px; }}
+            a {{ margin-right: 15px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="nav-links">
+                <a href="/?symbol={symbol}" class="btn btn-primary btn-sm">View All Data</a>
+                <a href="/volume-analysis?symbol={symbol}" class="btn btn-info btn-sm">Volume Analysis</a>
+                <a href="/price-analysis?symbol={symbol}" class="btn btn-success btn-sm">Price Analysis</a>
+                <a href="/close-analysis?symbol={symbol}" class="btn btn-warning btn-sm">Close Price Analysis</a>
+                <a href="/indicators?symbol={symbol}" class="btn btn-dark btn-sm">Indicators</a>
+                <a href="/daily-analysis?symbol={symbol}" class="btn btn-secondary btn-sm">Daily Analysis</a>
+            </div>
+            
+            <h1>{display_name(symbol)} - Technical Indicators</h1>
+            <p><strong>Analysis Period:</strong> {analysis_span(cube)}</p>
+            <p><strong>Maximum Drawdown:</strong> {format_stat(indicators.max_drawdown, '.2%')}</p>
+            
+            <div class="section">
+                <h3>Period Risk &amp; Return</h3>
+                <table class="table table-striped table-sm">
+                    <thead><tr><th>Period</th><th>Years</th><th>Days</th><th>Annual Return</th><th>Annual Volatility</th><th>Sharpe</th><th>Max Drawdown</th></tr></thead>
+                    <tbody>{period_rows}</tbody>
+                </table>
+            </div>
+            
+            <div class="section">
+                <h3>Latest Values</h3>
+                <p><a href="/api/indicators?symbol={symbol}&format=csv">Download daily series (CSV)</a></p>
+                <table class="table table-striped table-sm">
+                    <thead><tr><th>Indicator</th><th>Value</th></tr></thead>
+                    <tbody>{latest_rows}</tbody>
+                </table>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return render_page(html_template)
+
+@app.route('/api/downsample')
+def api_downsample():
+    """Return a date range downsampled to a chart width, by LTTB for one series or OHLC bucketing"""
+    symbol = get_loadable_symbol()
+    fmt = request.args.get('format', 'json').lower()
+    if fmt not in FORMATS:
+        abort(400, description=f'format must be one of: {", ".join(FORMATS)}')
+    try:
+        series, method, width, start, end = parse_downsample_args()
+    except ValueError as e:
+        abort(400, description=str(e))
+    
+    # The internal Period code is only used to color the chart, as in the root table it is left out
+    frame = downsampled_rows(symbol, series, method, width, start, end).drop(columns='Period')
+    try:
+        body = serialize(frame, fmt)
+    except ImportError:
+        abort(406, description='Arrow output requires the pyarrow package')
+    
+    if fmt == 'json':
+        body = (f'{{"symbol": {json.dumps(symbol)}, "method": "{method}", "width": {width}, '
+                f'"count": {len(frame)}, "data": {body}}}')
+    return Response(body, mimetype=FORMATS[fmt])
+
+def render_daily_chart(symbol, dpi, series, method, width, start, end):
+    """Render a downsampled daily line or candlestick chart, one color per period, as PNG bytes"""
+    frame = downsampled_rows(symbol, series, method, width, start, end)
+    codes = frame['Period'].to_numpy()
+    x = frame['Date'].to_numpy().astype('datetime64[D]').astype(float)
+    # Candle bodies fill most of the average spacing between bars
+    bar_width = 0.7 * (x[-1] - x[0]) / max(len(x) - 1, 1) if len(x) else 1.0
+    
+    # Pass plain lists so the chart can be rendered in a worker process
+    periods = []
+    for code, period in enumerate(PERIODS):
+        rows = codes == code
+        if not rows.any():
+            continue
+        entry = {'label': period['label'], 'color': period['color'], 'x': x[rows].tolist()}
+        if method == 'ohlc':
+            entry.update({name.lower(): frame[name].to_numpy()[rows].tolist() for name in ('Open', 'High', 'Low', 'Close')})
+            entry['width'] = bar_width
+        else:
+            entry['y'] = frame[series].to_numpy()[rows].tolist()
+        periods.append(entry)
+    
+    if method == 'ohlc':
+        kind, title, ylabel = 'daily_ohlc', f'{display_name(symbol)} Daily Price', 'Price ($)'
+    else:
+        kind, title, ylabel = 'daily_line', f'{display_name(symbol)} Daily {series}', series if series == 'Volume' else f'{series} Price ($)'
+    figsize = (width / dpi, width * 5 / 12 / dpi)
+    return render_pool.render(kind, periods, dpi, figsize=figsize, title=title, ylabel=ylabel)
+
+@app.route('/daily-chart.png')
+def daily_chart():
+    """Serve a cached, width-downsampled daily chart image with ETag/Last-Modified validation"""
+    get_loadable_symbol()
+    try:
+        series, method, width, start, end = parse_downsample_args()
+    except ValueError as e:
+        abort(400, description=str(e))
+    params = (series, method, width, start, end)
+    return chart_response('daily-chart', lambda symbol, dpi: render_daily_chart(symbol, dpi, *params), params)
+
+# Daily chart variants linked from /daily-analysis: (series, method, width, start, end)
+DAILY_CHART_VARIANTS = [('Close', 'ohlc', 1300, None, None), ('Volume', 'lttb', 1300, None, None)]
+
+def warm_daily_charts(symbol):
+    """Render the default daily chart variants into the chart cache"""
+    for params in DAILY_CHART_VARIANTS:
+        cached_chart('daily-chart', symbol, 100, lambda symbol, dpi: render_daily_chart(symbol, dpi, *params), params)
+
+# Most symbols compared when ?symbols= is not given
+COMPARE_LIMIT = 50
+
+def parse_symbols():
+    """Return the ?symbols= list (default: DEFAULT_SYMBOL then its peers, COMPARE_LIMIT in all), 404 on unknown ones"""
+    symbols = list(dict.fromkeys(symbol.lower() for symbol in request.args.get('symbols', '').split(',') if symbol))
+    if not symbols:
+        # The default comparison is DEFAULT_SYMBOL against its peers, so it leads as the base
+        base = [DEFAULT_SYMBOL] if DEFAULT_SYMBOL in symbol_registry else []
+        symbols = (base + [symbol for symbol in symbol_registry.symbols() if symbol != DEFAULT_SYMBOL])[:COMPARE_LIMIT]
+    for symbol in symbols:
+        if symbol not in symbol_registry:
+            abort(404, description=f'Unknown symbol: {symbol}')
+        if symbol_registry.streams(symbol):
+            abort(413, description=f'{symbol} is too large to load for a comparison')
+    return symbols
+
+def get_comparison(symbols):
+    """Return (body, etag) of the comparison JSON, cached per symbol list and file versions"""
+    versions = tuple(symbol_registry.file_version(symbol) for symbol in symbols)
+    key = ('compare', tuple(symbols), versions)
+
+    def render():
+        tickers = compare_pool.load([symbol_registry.info(symbol)['path'] for symbol in symbols])
+        return json.dumps(compare(symbols, tickers)).encode()
+
+    return chart_cache.get_or_render(key, render)
+
+@app.route('/api/compare')
+def api_compare():
+    """Return return correlations, per-period relative performance and ranked volume changes as JSON"""
+    body, etag = get_comparison(parse_symbols())
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def percent(value):
+    """Format a fraction as a percentage cell, 'n/a' for missing values"""
+    return 'n/a' if value is None else f'{value:.2%}'
+
+@app.route('/compare')
+def compare_tickers():
+    """Compare tickers side by side: return correlations, relative performance per period and volume shifts"""
+    symbols = parse_symbols()
+    result = json.loads(get_comparison(symbols)[0])
+    base = result['base']
+    query = urlencode({'symbols': ','.join(symbols)})
+    
+    # Correlation matrix of daily returns over the common dates
+    header = ''.join(f'<th>{symbol.upper()}</th>' for symbol in symbols)
+    correlation_rows = ''.join(
+        f"<tr><th>{symbol.upper()}</th>{''.join('<td>n/a</td>' if value is None else f'<td>{value:.2f}</td>' for value in row)}</tr>"
+        for symbol, row in zip(symbols, result['correlation'])
+    )
+    
+    # Total return in each period and the excess over the base symbol
+    period_rows = ''.join(
+        f"<tr><td>{period['label']}</td>"
+        f"{''.join(f'<td>{percent(period[kind][symbol])}</td>' for kind in ('returns', 'excess') for symbol in symbols)}</tr>"
+        for period in result['periods']
+    )
+    
+    # Tickers ranked by the change in mean volume from one period to the next
+    volume_sections = ''.join(
+        f"""<div class="col-md-4"><h5>{change['from']} &rarr; {change['to']}</h5>
+            <table class="table table-striped table-sm"><tbody>
+            {''.join(f"<tr><td>{rank}</td><td>{entry['symbol'].upper()}</td><td>{percent(entry['change'])}</td></tr>"
+                     for rank, entry in enumerate(change['ranking'], 1))}
+            </tbody></table></div>"""
+        for change in result['volume_changes']
+    )
+    
+    # Create HTML template with comparison tables
+    html_template = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{base.upper()} Peer Comparison</title>
+        <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
+        <style>
+            body {{ padding: 20px; }}
+            .container {{ max-width: 1400px; }}
+            .section {{ margin-top: 40px; }}
+            .nav-links {{ margin-bottom: 20px; }}
+            a {{ margin-right: 15px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="nav-links">
+                <a href="/?symbol={base}" class="btn btn-primary btn-sm">View All Data</a>
+                <a href="/indicators?symbol={base}" class="btn btn-dark btn-sm">Indicators</a>
+                <a href="/daily-analysis?symbol={base}" class="btn btn-secondary btn-sm">Daily Analysis</a>
+            </div>
+            
+            <h1>{display_name(base)} vs Peers</h1>
+            <p><strong>Common Dates:</strong> {result['first_date'] or 'n/a'} to {result['last_date'] or 'n/a'} ({result['days']:,} days)</p>
+            
+            <div class="section">
+                <h3>Correlation of Daily Returns</h3>
+                <table class="table table-bordered table-sm">
+                    <thead><tr><th></th>{header}</tr></thead>
+                    <tbody>{correlation_rows}</tbody>
+                </table>
+            </div>
+            
+            <div class="section">
+                <h3>Performance by Period</h3>
+                <table class="table table-striped table-sm">
+                    <thead>
+                        <tr><th></th><th colspan="{len(symbols)}">Total Return</th><th colspan="{len(symbols)}">vs {base.upper()}</th></tr>
+                        <tr><th>Period</th>{header}{header}</tr>
+                    </thead>
+                    <tbody>{period_rows}</tbody>
+                </table>
+            </div>
+            
+            <div class="section">
+                <h3>Volume Change Rankings</h3>
+                <p><a href="/api/compare?{query}">Download comparison (JSON)</a></p>
+                <div class="row">{volume_sections}</div>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return render_page(html_template)
+
+def unless_streamed(warm):
+    """Skip a warm-up task that needs the whole dataset in memory for symbols aggregated in chunks"""
+    return lambda symbol: None if symbol_registry.streams(symbol) else warm(symbol)
+
+# Artifacts computed ahead of the first request, in order; each warms the same cache entry a route uses
+WARMUP_TASKS = [
+    ('dataset', unless_streamed(load_and_process_data)),
+    ('date_index', unless_streamed(get_date_index)),
+    ('cube', get_cube),
+    ('indicators', unless_streamed(get_indicators)),
+    ('volume-analysis.png', lambda symbol: cached_chart('volume-analysis', symbol, 100, render_volume_chart)),
+    ('price-analysis.png', lambda symbol: cached_chart('price-analysis', symbol, 100, render_open_chart)),
+    ('close-analysis.png', lambda symbol: cached_chart('close-analysis', symbol, 100, render_close_chart)),
+    ('daily-chart.png', unless_streamed(warm_daily_charts)),
+]
+
+# Background warm-up of GS_WARMUP_SYMBOLS, started by the first request and rerun whenever their files change
+warmup_scheduler = None
+warmup_lock = threading.Lock()
+
+def start_warmup():
+    """Start the background warm-up once, unless GS_WARMUP=0; a server may call this before serving"""
+    global warmup_scheduler
+    with warmup_lock:
+        if warmup_scheduler is None and os.environ.get('GS_WARMUP', '1') != '0':
+            warmup_scheduler = WarmupScheduler(
+                symbol_registry,
+                symbols=[symbol for symbol in os.environ.get('GS_WARMUP_SYMBOLS', DEFAULT_SYMBOL).split(',') if symbol],
+                tasks=WARMUP_TASKS,
+                max_workers=int(os.environ.get('GS_WARMUP_WORKERS', 2)),
+                interval=float(os.environ.get('GS_WARMUP_INTERVAL', 5)),
+            ).start()
+    return warmup_scheduler
+
+@app.before_request
+def start_warmup_on_first_request():
+    """Start the warm-up with the first request rather than on import, so importing data starts no threads"""
+    if warmup_scheduler is None:
+        start_warmup()
+
+@app.route('/daily-analysis')
+def daily_analysis():
+    """Show daily-resolution price candlesticks and volume, downsampled to the chart width"""
+    symbol = get_loadable_symbol()
+    cube = get_cube(symbol)
+    query = urlencode({key: value for key, value in (('symbol', symbol), ('start', request.args.get('start')),
+                                                     ('end', request.args.get('end'))) if value})
+    
+    # Create HTML template with charts
+    html_template = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{symbol.upper()} Daily Analysis</title>
+        <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@4.6.0/css/bootstrap.min.css">
+        <style>
+            body {{ padding: 20px; }}
+            .container {{ max-width: 1400px; }}
+            .chart-container {{ margin-top: 30px; text-align: center; }}
+            img {{ max-width: 100%; height: auto; }}
+            .nav-links {{ margin-bottom: 20px; }}
+            a {{ margin-right: 15px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="nav-links">
+                <a href="/?symbol={symbol}" class="btn btn-primary btn-sm">View All Data</a>
+                <a href="/volume-analysis?symbol={symbol}" class="btn btn-info btn-sm">Volume Analysis</a>
+                <a href="/price-analysis?symbol={symbol}" class="btn btn-success btn-sm">Price Analysis</a>
+                <a href="/close-analysis?symbol={symbol}" class="btn btn-warning btn-sm">Close Price Analysis</a>
+                <a href="/indicators?symbol={symbol}" class="btn btn-dark btn-sm">Indicators</a>
+                <a href="/daily-analysis?symbol={symbol}" class="btn btn-secondary btn-sm">Daily Analysis</a>
+            </div>
+            
+            <h1>{display_name(symbol)} - Daily Price &amp; Volume</h1>
+            <p><strong>Analysis Period:</strong> {analysis_span(cube)}</p>
+            <p>Daily rows are downsampled on the server to fit the chart width:
+               OHLC bucketing for candlesticks and LTTB for the volume line.
+               <a href="/api/downsample?{query}&method=ohlc">Download candlestick bars (JSON)</a></p>
+            
+            <div class="chart-container">
+                <img src="/daily-chart.png?{query}&method=ohlc&width=1300" alt="Daily Price Candlestick Chart">
+            </div>
+            
+            <div class="chart-container">
+                <img src="/daily-chart.png?{query}&series=Volume&method=lttb&width=1300" alt="Daily Volume Chart">
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return render_page(html_template)
     app.run(debug=True)
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from compact import PRICE_COLUMNS, price_array
+from timing import stage
+
+# Minimum and maximum point budgets accepted from a requested pixel width
+MIN_POINTS = 3
+MAX_POINTS = 10000
+
+# Downsampling methods and the horizontal pixels each output point is given
+METHODS = {'lttb': 1, 'ohlc': 4}
+
+
+def points_for_width(width, pixels_per_point=1):
+    """Point budget for a chart of the given pixel width"""
+    return int(min(max(width // pixels_per_point, MIN_POINTS), MAX_POINTS))
+
+
+def bucket_edges(n, n_buckets):
+    """Split n rows into n_buckets contiguous, near-equal buckets; returns n_buckets + 1 edges"""
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices of the kept points
+
+    The first and last points are always kept. Every bucket in between keeps the point that
+    forms the largest triangle with the previously kept point and the next bucket's average.
+    Areas within a bucket are evaluated with array operations; only the walk from bucket to
+    bucket is sequential, because each choice depends on the previous one.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < MIN_POINTS:
+        return np.arange(n)
+
+    # Interior buckets over rows 1 .. n-2, plus each bucket's mean for the look-ahead anchor
+    edges = bucket_edges(n - 2, n_out - 2) + 1
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x, edges[:-1]) / counts
+    mean_y = np.add.reduceat(y, edges[:-1]) / counts
+    # The last point is the look-ahead anchor for the final bucket
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[prev] - next_x[bucket]) * (by - y[prev]) - (x[prev] - bx) * (next_y[bucket] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        selected[bucket + 1] = prev
+    return selected
+
+
+def ohlc_buckets(open_, high, low, close, volume, n_out):
+    """Aggregate consecutive rows into at most n_out OHLC bars
+
+    Returns (starts, open, high, low, close, volume), where starts is the first row index of
+    each bar, for labeling it with that row's date.
+    """
+    n = len(close)
+    if n == 0:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty
+    n_out = min(n_out, n)
+    edges = bucket_edges(n, n_out)
+    starts, ends = edges[:-1], edges[1:]
+    return (
+        starts,
+        np.asarray(open_)[starts],
+        np.maximum.reduceat(high, starts),
+        np.minimum.reduceat(low, starts),
+        np.asarray(close)[ends - 1],
+        np.add.reduceat(volume, starts),
+    )
+
+
+@stage('downsample')
+def downsample_frame(df, series, method, n_out):
+    """Downsample a date-sorted, period-coded OHLCV slice to at most n_out rows
+
+    'lttb' keeps Date, the series column and Period for the selected rows; 'ohlc' returns one
+    Date/Open/High/Low/Close/Volume/Period bar per bucket, labeled by the bucket's first row.
+    """
+    if method not in METHODS:
+        raise ValueError(f'Unknown downsampling method: {method}')
+    dates = df['Date'].to_numpy()
+    codes = df['Period'].to_numpy()
+
+    if method == 'lttb':
+        # Triangle areas use real day spacing, so weekend and holiday gaps are respected
+        x = dates.astype('datetime64[D]').astype(np.float64)
+        values = price_array(df, series) if series in PRICE_COLUMNS else df[series].to_numpy().astype(np.int64)
+        keep = lttb(x, values, n_out)
+        return pd.DataFrame({'Date': dates[keep], series: values[keep], 'Period': codes[keep]})
+
+    # Volume is summed in int64 so wide buckets of int32 volumes cannot overflow
+    starts, open_, high, low, close, volume = ohlc_buckets(
+        price_array(df, 'Open'), price_array(df, 'High'), price_array(df, 'Low'),
+        price_array(df, 'Close'), df['Volume'].to_numpy().astype(np.int64), n_out)
+    return pd.DataFrame({'Date': dates[starts], 'Open': open_, 'High': high, 'Low': low,
+                         'Close': close, 'Volume': volume, 'Period': codes[starts]})
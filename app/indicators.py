@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from compact import price_array
+from timing import stage
+
+# Default indicator windows (in trading days)
+SMA_WINDOWS = (20, 50, 200)
+EMA_SPANS = (12, 26)
+VOLATILITY_WINDOWS = (20, 60)
+ATR_WINDOW = 14
+TRADING_DAYS = 252
+
+
+def rolling_means(values, windows):
+    """Trailing means of several window lengths from a single cumulative sum
+
+    Returns a (len(windows), n) array; the first window - 1 entries of each row are NaN.
+    Differences of a running sum lose about eps * sum(values) of absolute precision, which
+    is negligible for price series of a few million rows.
+    """
+    n = len(values)
+    csum = np.empty(n + 1)
+    csum[0] = 0.0
+    np.cumsum(values, out=csum[1:])
+
+    out = np.full((len(windows), n), np.nan)
+    for row, window in enumerate(windows):
+        if window <= n:
+            out[row, window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def rolling_stds(values, windows):
+    """Trailing sample standard deviations of several window lengths from one pass of cumulative sums"""
+    n = len(values)
+    csum = np.zeros(n + 1)
+    csum2 = np.zeros(n + 1)
+    np.cumsum(values, out=csum[1:])
+    np.cumsum(values * values, out=csum2[1:])
+
+    out = np.full((len(windows), n), np.nan)
+    for row, window in enumerate(windows):
+        if 1 < window <= n:
+            s1 = csum[window:] - csum[:-window]
+            s2 = csum2[window:] - csum2[:-window]
+            var = (s2 - s1 * s1 / window) / (window - 1)
+            # Guard against tiny negative values from floating point cancellation
+            out[row, window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def exponential_means(values, spans=(), alphas=()):
+    """Recursive (adjust=False) exponential moving averages for several spans or smoothing factors
+
+    The recurrence is evaluated by pandas' compiled ewm kernel rather than a Python loop.
+    """
+    series = pd.Series(values)
+    rows = [series.ewm(span=span, adjust=False).mean().to_numpy() for span in spans]
+    rows += [series.ewm(alpha=alpha, adjust=False).mean().to_numpy() for alpha in alphas]
+    return np.vstack(rows) if rows else np.empty((0, len(values)))
+
+
+def true_range(high, low, close):
+    """Daily true range: the largest of high-low and the gaps from the previous close"""
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.nanmax(ranges, axis=0)
+
+
+def drawdown(close):
+    """Fractional drawdown from the running peak at every row"""
+    peak = np.maximum.accumulate(close)
+    return close / peak - 1.0
+
+
+class IndicatorSet:
+    """Technical indicators for one dataset, computed once over contiguous arrays"""
+
+    def __init__(self, df, sma_windows=SMA_WINDOWS, ema_spans=EMA_SPANS,
+                 volatility_windows=VOLATILITY_WINDOWS, atr_window=ATR_WINDOW):
+        close = np.ascontiguousarray(price_array(df, 'Close'))
+        high = np.ascontiguousarray(price_array(df, 'High'))
+        low = np.ascontiguousarray(price_array(df, 'Low'))
+        codes = df['Period'].to_numpy()
+
+        self.dates = df['Date'].to_numpy()
+        self.codes = codes
+
+        # Daily log returns (NaN on the first row)
+        log_close = np.log(close)
+        returns = np.empty_like(close)
+        returns[0] = np.nan
+        returns[1:] = np.diff(log_close)
+        self.returns = returns
+
+        columns = {}
+        for window, values in zip(sma_windows, rolling_means(close, sma_windows)):
+            columns[f'SMA_{window}'] = values
+        # EMAs are recursive, so each span is one pass of the compiled ewm kernel
+        ema_rows = exponential_means(close, spans=ema_spans)
+        for span, values in zip(ema_spans, ema_rows):
+            columns[f'EMA_{span}'] = values
+
+        # Volatility windows start from the second row, where returns are defined
+        vol = np.full((len(volatility_windows), len(close)), np.nan)
+        vol[:, 1:] = rolling_stds(returns[1:], volatility_windows) * np.sqrt(TRADING_DAYS)
+        for window, values in zip(volatility_windows, vol):
+            columns[f'Volatility_{window}'] = values
+
+        atr = exponential_means(true_range(high, low, close), alphas=(1.0 / atr_window,))[0]
+        atr[:atr_window - 1] = np.nan
+        columns[f'ATR_{atr_window}'] = atr
+        columns['Drawdown'] = drawdown(close)
+        self.columns = columns
+
+        self.max_drawdown = float(columns['Drawdown'].min()) if len(close) else float('nan')
+        self.period_stats = self._period_stats(close, returns, codes)
+
+    @staticmethod
+    def _period_stats(close, returns, codes):
+        """Annualized return, volatility, Sharpe ratio and max drawdown per period code"""
+        n_periods = int(codes.max()) + 1 if len(codes) else 0
+        valid = ~np.isnan(returns)
+        r = np.where(valid, returns, 0.0)
+
+        # Vectorized per-period moments with bincount instead of a groupby
+        count = np.bincount(codes, weights=valid, minlength=n_periods)
+        total = np.bincount(codes, weights=r, minlength=n_periods)
+        total2 = np.bincount(codes, weights=r * r, minlength=n_periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            std = np.sqrt(np.maximum(total2 - total * mean, 0.0) / (count - 1))
+            sharpe = mean / std * np.sqrt(TRADING_DAYS)
+
+        # Periods are contiguous in a date-sorted frame, so each has one running peak
+        max_drawdown = np.full(n_periods, np.nan)
+        starts = np.searchsorted(codes, np.arange(n_periods), side='left')
+        ends = np.searchsorted(codes, np.arange(n_periods), side='right')
+        for code, (start, end) in enumerate(zip(starts, ends)):
+            if end > start:
+                max_drawdown[code] = drawdown(close[start:end]).min()
+
+        return pd.DataFrame({
+            'Days': count.astype(int),
+            'AnnualReturn': mean * TRADING_DAYS,
+            'AnnualVolatility': std * np.sqrt(TRADING_DAYS),
+            'Sharpe': sharpe,
+            'MaxDrawdown': max_drawdown,
+        }, index=pd.Index(range(n_periods), name='Period'))
+
+    def frame(self, lo=0, hi=None, columns=None):
+        """Return rows lo:hi of the daily indicator series as a DataFrame"""
+        names = columns or list(self.columns)
+        data = {'Date': self.dates[lo:hi]}
+        data.update({name: self.columns[name][lo:hi] for name in names})
+        return pd.DataFrame(data)
+
+    def latest(self):
+        """Return the most recent value of every indicator"""
+        return {name: float(values[-1]) for name, values in self.columns.items() if len(values)}
+
+
+@stage('indicators')
+def build_indicators(df):
+    """Build the default indicator set for a period-coded dataset frame"""
+    return IndicatorSet(df)
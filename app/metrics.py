@@ -0,0 +1,98 @@
+import threading
+from bisect import bisect_left
+
+# Histogram bucket upper bounds: latencies in seconds, sizes in bytes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(10))  # 1 KiB .. 256 MiB
+
+# Help text for every histogram family the app records
+HISTOGRAMS = {
+    'gs_stage_seconds': ('Time spent in each data pipeline stage, excluding the stages nested inside it', LATENCY_BUCKETS),
+    'gs_stage_allocated_bytes': ('Net traced memory growth of each stage (only while tracemalloc is on)', SIZE_BUCKETS),
+    'gs_request_seconds': ('Request latency by route', LATENCY_BUCKETS),
+    'gs_response_bytes': ('Response body size by route', SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus data model"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # The last slot counts values above every bound (the +Inf bucket)
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def escape_label(value):
+    """Escape a label value for the text exposition format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    """Format label pairs as {name="value",...} (empty when there are none)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+class MetricsRegistry:
+    """Process-wide histograms keyed by family name and label pairs"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, name, labels, value):
+        """Record one observation, e.g. observe('gs_stage_seconds', (('stage', 'groupby'),), 0.012)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = Histogram(HISTOGRAMS[name][1])
+            histogram.observe(value)
+
+    def clear(self):
+        """Drop every recorded observation"""
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """Return every histogram in the Prometheus text exposition format"""
+        with self._lock:
+            snapshot = sorted((key, list(h.counts), h.sum, h.count, h.buckets) for key, h in self._histograms.items())
+
+        lines = []
+        for family, (help_text, _) in HISTOGRAMS.items():
+            series = [entry for entry in snapshot if entry[0][0] == family]
+            if not series:
+                continue
+            lines.append(f'# HELP {family} {help_text}')
+            lines.append(f'# TYPE {family} histogram')
+            for (_, labels), counts, total, count, buckets in series:
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{family}_bucket{format_labels(labels + (("le", bound),))} {cumulative}')
+                lines.append(f'{family}_sum{format_labels(labels)} {total!r}')
+                lines.append(f'{family}_count{format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def format_samples(name, kind, help_text, samples):
+    """Format a gauge or counter family from (labels, value) pairs"""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    lines += [f'{name}{format_labels(labels)} {value}' for labels, value in samples]
+    return '\n'.join(lines) + '\n'
+
+
+# Shared registry that the stage timers and request hooks record into
+METRICS = MetricsRegistry()
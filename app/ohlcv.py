@@ -0,0 +1,99 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from compact import expand_frame
+from timing import stage
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Resampling rules and how each column is aggregated into a bar
+RESAMPLE_RULES = {'weekly': 'W-FRI', 'monthly': 'ME'}
+RESAMPLE_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+FORMATS = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+
+class DateIndex:
+    """Sorted epoch-day index over a frame's Date column for O(log n) range lookups"""
+
+    def __init__(self, dates):
+        self.days = dates.to_numpy(dtype='datetime64[D]').astype(np.int32)
+
+    def extend(self, new_rows):
+        """Return an index that also covers rows appended to the dataset"""
+        index = DateIndex.__new__(DateIndex)
+        index.days = np.concatenate([self.days, DateIndex(new_rows['Date']).days])
+        return index
+
+    @staticmethod
+    def to_day(value):
+        """Convert a date-like value to days since the epoch"""
+        return int(pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype(np.int64))
+
+    def locate(self, start=None, end=None):
+        """Return the (lo, hi) row positions of start <= Date <= end using binary search"""
+        lo = int(np.searchsorted(self.days, self.to_day(start), side='left')) if start is not None else 0
+        hi = int(np.searchsorted(self.days, self.to_day(end), side='right')) if end is not None else len(self.days)
+        return lo, max(lo, hi)
+
+
+def parse_columns(value):
+    """Parse a comma-separated column projection, defaulting to every OHLCV column"""
+    if not value:
+        return list(OHLCV_COLUMNS)
+    by_name = {column.lower(): column for column in OHLCV_COLUMNS}
+    columns = []
+    for name in value.split(','):
+        name = name.strip().lower()
+        if name == 'date':
+            continue
+        if name not in by_name:
+            raise ValueError(f'Unknown column: {name}')
+        if by_name[name] not in columns:
+            columns.append(by_name[name])
+    return columns
+
+
+def select(df, index, start=None, end=None, columns=None, resample=None):
+    """Slice a date range with the index, project columns and optionally resample to bars"""
+    columns = columns or list(OHLCV_COLUMNS)
+    with stage('slicing'):
+        lo, hi = index.locate(start, end)
+        # Only the selected rows and columns are widened back to float64/int64
+        frame = expand_frame(df.iloc[lo:hi][['Date'] + columns])
+
+    if resample:
+        if resample not in RESAMPLE_RULES:
+            raise ValueError(f'Unknown resample period: {resample}')
+        with stage('groupby'):
+            resampler = frame.set_index('Date')[columns].resample(RESAMPLE_RULES[resample])
+            bars = resampler.agg({column: RESAMPLE_AGG[column] for column in columns})
+            # Drop periods without any trading days (e.g. a fully closed week)
+            bars = bars[resampler.size().to_numpy() > 0].reset_index()
+            return bars[['Date'] + columns]
+
+    return frame
+
+
+@stage('serialize')
+def serialize(frame, fmt):
+    """Serialize a selected frame as JSON records, CSV text or Arrow IPC stream bytes"""
+    if fmt == 'csv':
+        return frame.to_csv(index=False, date_format='%Y-%m-%d')
+    if fmt == 'arrow':
+        # pyarrow is optional; callers turn the ImportError into a 406 response
+        import pyarrow as pa
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+
+    frame = frame.assign(Date=frame['Date'].dt.strftime('%Y-%m-%d'))
+    return frame.to_json(orient='records')
@@ -0,0 +1,106 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Default analysis periods. Each period runs from its start date up to the day before the
+# next period's start; the first period has no start and the last has no end.
+DEFAULT_PERIODS = [
+    {
+        'label': 'Pre-2008 Crisis',
+        'title': 'Pre-2008 Financial Crisis',
+        'start': None,
+        'description': 'Early growth and market expansion period',
+        'color': '#2E86AB',
+        'marker': 'o',
+    },
+    {
+        'label': 'Crisis & Recovery',
+        'title': 'Financial Crisis & Recovery',
+        'start': '2008-01-01',
+        'description': 'Crisis impact and recovery period',
+        'color': '#A23B72',
+        'marker': 's',
+    },
+    {
+        'label': 'Post-Recovery Growth',
+        'title': 'Post-Recovery Growth',
+        'start': '2013-01-01',
+        'description': 'Sustained growth and market recovery',
+        'color': '#F18F01',
+        'marker': '^',
+    },
+]
+
+# Fallback styling for configured periods that do not set their own
+DEFAULT_COLORS = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#3B1F2B', '#44BBA4', '#6C757D']
+DEFAULT_MARKERS = ['o', 's', '^', 'D', 'v', 'P', 'X']
+
+
+class PeriodScheme:
+    """Ordered, labeled date breakpoints that split a date series into period codes"""
+
+    def __init__(self, periods):
+        if not periods:
+            raise ValueError('At least one period must be configured')
+        self.periods = []
+        for i, period in enumerate(periods):
+            period = dict(period)
+            period.setdefault('title', period['label'])
+            period.setdefault('description', '')
+            period.setdefault('color', DEFAULT_COLORS[i % len(DEFAULT_COLORS)])
+            period.setdefault('marker', DEFAULT_MARKERS[i % len(DEFAULT_MARKERS)])
+            period['start'] = period.get('start') if i else None
+            self.periods.append(period)
+
+        # Breakpoints are the start dates of every period after the first, as epoch days
+        starts = []
+        for period in self.periods[1:]:
+            # pd.Timestamp(None) is NaT, which would sort before every date instead of failing
+            try:
+                start = pd.Timestamp(period['start']) if period['start'] else pd.NaT
+            except ValueError:
+                start = pd.NaT
+            if pd.isna(start):
+                raise ValueError(f"Period {period['label']!r} needs a valid start date, got {period['start']!r}")
+            starts.append(start)
+        if any(later <= earlier for earlier, later in zip(starts, starts[1:])):
+            raise ValueError('Period start dates must be strictly increasing')
+        self.breakpoints = np.array([start.to_datetime64().astype('datetime64[D]').astype(np.int64)
+                                     for start in starts], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.periods)
+
+    def __iter__(self):
+        return iter(self.periods)
+
+    def __getitem__(self, code):
+        return self.periods[code]
+
+    def assign(self, dates):
+        """Return an int8 period code for every date in one vectorized searchsorted pass"""
+        days = dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+        return np.searchsorted(self.breakpoints, days, side='right').astype(np.int8)
+
+    def bounds(self, code):
+        """Return the (start, end) dates of a period as YYYY-MM-DD strings, None when open-ended"""
+        start = self.periods[code]['start']
+        end = None
+        if code + 1 < len(self.periods):
+            end = (pd.Timestamp(self.periods[code + 1]['start']) - pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        return (pd.Timestamp(start).strftime('%Y-%m-%d') if start else None), end
+
+
+def load_periods():
+    """Load the period scheme from GS_PERIODS_FILE (a JSON list of periods) or the defaults"""
+    path = os.environ.get('GS_PERIODS_FILE')
+    if not path:
+        return PeriodScheme(DEFAULT_PERIODS)
+    with open(path) as f:
+        return PeriodScheme(json.load(f))
+
+
+# Process-wide period scheme used when loading datasets
+PERIODS = load_periods()
@@ -0,0 +1,28 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+class ProcessPool:
+    """A lazily started pool of spawned worker processes; max_workers=0 means run inline"""
+
+    def __init__(self, max_workers=0):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Create the process pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit the parent's threads or locks
+                context = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes, if any were started"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,86 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+from timing import recording
+
+# Only one request at a time runs under cProfile; overlapping ones report stages and memory only
+_profiler_lock = threading.Lock()
+
+# Number of active profiles that need tracemalloc, and whether they started it (GS_TRACE_MEMORY may have)
+_tracers = 0
+_owns_tracing = False
+_tracers_lock = threading.Lock()
+
+
+def _start_tracing():
+    global _tracers, _owns_tracing
+    with _tracers_lock:
+        if _tracers == 0:
+            _owns_tracing = not tracemalloc.is_tracing()
+            if _owns_tracing:
+                tracemalloc.start()
+        _tracers += 1
+
+
+def _stop_tracing():
+    global _tracers, _owns_tracing
+    with _tracers_lock:
+        _tracers -= 1
+        if _tracers == 0 and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+
+
+class RequestProfile:
+    """cProfile, tracemalloc and stage timings for a single request, summarized as text"""
+
+    def __init__(self, limit=25):
+        self.limit = limit
+        self.profiler = None
+        self._recording = recording()
+
+    def start(self):
+        """Begin profiling the current thread; returns self"""
+        _start_tracing()
+        tracemalloc.reset_peak()
+        self.memory_before = tracemalloc.get_traced_memory()[0]
+        self.snapshot_before = tracemalloc.take_snapshot()
+        self.stages = self._recording.__enter__()
+        if _profiler_lock.acquire(blocking=False):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Stop collecting and return the stage timings (seconds) and the text summary"""
+        elapsed = time.perf_counter() - self.started
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profiler_lock.release()
+        self._recording.__exit__(None, None, None)
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().compare_to(self.snapshot_before, 'lineno')[:10]
+        _stop_tracing()
+
+        lines = [f'Total: {elapsed * 1000:.1f} ms']
+        lines.append('Stages (ms): ' + (', '.join(f'{name} {seconds * 1000:.1f}' for name, seconds
+                                                 in sorted(self.stages.items(), key=lambda item: -item[1])) or 'none'))
+        lines.append(f'Traced memory: peak {(peak - self.memory_before) / 2**20:.2f} MiB above start, '
+                     f'net {(current - self.memory_before) / 2**20:+.2f} MiB')
+        lines.append('')
+        lines.append('Top allocations (tracemalloc, by net size):')
+        lines += [f'  {stat}' for stat in top]
+        lines.append('')
+        if self.profiler is None:
+            lines.append('cProfile skipped: another request was being profiled')
+        else:
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats('cumulative').print_stats(self.limit)
+            lines.append(f'cProfile (top {self.limit} by cumulative time):')
+            lines.append(out.getvalue().strip('\n'))
+        return self.stages, '\n'.join(lines) + '\n'
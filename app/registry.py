@@ -0,0 +1,232 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from singleflight import SingleFlight
+from store import DatasetStore
+
+# Suffix shared by every per-ticker file in the Kaggle dataset (e.g. gs.us.txt)
+SYMBOL_SUFFIX = '.us.txt'
+
+
+def read_date_range(file_path):
+    """Return the first and last Date strings of an OHLCV file without parsing it"""
+    with open(file_path, 'rb') as f:
+        f.readline()  # header
+        first = f.readline().split(b',', 1)[0].strip()
+        if not first:
+            return None, None
+
+        # Walk back from the end of the file to the start of the last non-empty line
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = min(end, 4096)
+        f.seek(end - block)
+        lines = [line for line in f.read(block).splitlines() if line.strip()]
+        last = lines[-1].split(b',', 1)[0].strip()
+    return first.decode(), last.decode()
+
+
+def frame_nbytes(df):
+    """Approximate memory held by a loaded dataset frame"""
+    return int(df.memory_usage(index=True).sum())
+
+
+def value_nbytes(value):
+    """Approximate memory held by a derived value: frames and arrays, directly or in its attributes"""
+    if isinstance(value, pd.DataFrame):
+        return frame_nbytes(value)
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(value_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(value_nbytes(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return value_nbytes(vars(value))
+    return 0
+
+
+class SymbolRegistry:
+    """Index of per-ticker files with lazily loaded, memory-bounded LRU datasets"""
+
+    def __init__(self, data_dir, max_bytes=256 * 1024 * 1024, stream_bytes=None):
+        self.data_dir = data_dir
+        self.max_bytes = max_bytes
+        self.stream_bytes = stream_bytes
+        self._lock = threading.Lock()
+        self._index = {}
+        self._stores = OrderedDict()
+        self._sizes = {}
+        self._retired = {'hits': 0, 'misses': 0, 'reloads': 0, 'appends': 0, 'rejected': 0, 'coalesced': 0}
+        self.evictions = 0
+        self._streamed = OrderedDict()
+        self._flights = SingleFlight()
+        self.scan()
+
+    def scan(self):
+        """Index every *.us.txt file in the data directory with its date range"""
+        index = {}
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(SYMBOL_SUFFIX) or not entry.is_file():
+                    continue
+                first, last = read_date_range(entry.path)
+                if first is None:
+                    # Kaggle ships some header-only files; there is nothing to serve
+                    continue
+                symbol = entry.name[:-len(SYMBOL_SUFFIX)].lower()
+                index[symbol] = {'path': entry.path, 'first_date': first, 'last_date': last}
+        with self._lock:
+            self._index = index
+        return len(index)
+
+    def symbols(self):
+        """Return the sorted list of indexed symbols"""
+        return sorted(self._index)
+
+    def info(self, symbol):
+        """Return the indexed path and date range for a symbol, or None"""
+        return self._index.get(symbol.lower())
+
+    def __contains__(self, symbol):
+        return symbol.lower() in self._index
+
+    def get(self, symbol):
+        """Return the dataset tuple for a symbol, loading it on first access"""
+        return self.get_entry(symbol)[1]
+
+    def get_entry(self, symbol):
+        """Return a (version, data) pair for a symbol, loading it on first access"""
+        return self._load(symbol, lambda store: store.get_entry())
+
+    def derived(self, symbol, name, build):
+        """Return a value derived from a symbol's dataset, cached per dataset version"""
+        return self._load(symbol, lambda store: store.derived(name, build))
+
+    def _path(self, symbol):
+        """Return the indexed file path of a symbol, raising KeyError when it is unknown"""
+        info = self._index.get(symbol.lower())
+        if info is None:
+            raise KeyError(symbol)
+        return info['path']
+
+    def file_version(self, symbol):
+        """Return the (mtime_ns, size) of a symbol's file without loading it"""
+        stat = os.stat(self._path(symbol))
+        return stat.st_mtime_ns, stat.st_size
+
+    def streams(self, symbol):
+        """Whether a symbol's file is over stream_bytes and is aggregated in chunks instead of loaded"""
+        return self.stream_bytes is not None and os.path.getsize(self._path(symbol)) > self.stream_bytes
+
+    def streamed(self, symbol, name, build):
+        """Return build(path) for a symbol's file, cached per file version without loading the dataset
+
+        Streamed values count against max_bytes like loaded datasets and are evicted after them.
+        """
+        symbol = symbol.lower()
+        path = self._path(symbol)
+        version = self.file_version(symbol)
+        key = (symbol, name)
+        with self._lock:
+            cached = self._streamed.get(key)
+            if cached is not None and cached[0] == version:
+                self._streamed.move_to_end(key)
+                self._evict(keep=key)
+                return cached[1]
+
+        def build_and_keep():
+            cached = self._streamed.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            value = build(path)
+            with self._lock:
+                self._streamed[key] = (version, value, value_nbytes(value))
+                self._streamed.move_to_end(key)
+                self._evict(keep=key)
+            return value
+
+        return self._flights.do((symbol, name, version), build_and_keep)
+
+    def _load(self, symbol, fetch):
+        """Look up (or create) a symbol's store, call fetch(store) and enforce the memory budget"""
+        symbol = symbol.lower()
+        with self._lock:
+            info = self._index.get(symbol)
+            if info is None:
+                raise KeyError(symbol)
+            store = self._stores.get(symbol)
+            if store is None:
+                store = DatasetStore(info['path'])
+                self._stores[symbol] = store
+            self._stores.move_to_end(symbol)
+
+        result = fetch(store)
+
+        with self._lock:
+            version, data = store.version, store.data
+            if symbol in self._stores and data is not None:
+                # Count the frame and every value derived from it (cube, indicators, date index),
+                # measured once per loaded version and set of derived values rather than on every access
+                derived = store.derived_values()
+                key = (version, frozenset(derived))
+                if self._sizes.get(symbol, (None,))[0] != key:
+                    self._sizes[symbol] = (key, frame_nbytes(data) + sum(map(value_nbytes, derived.values())))
+                self._evict(keep=symbol)
+        return result
+
+    def _resident_bytes(self):
+        """Total measured size of the resident datasets and streamed values"""
+        return (sum(nbytes for _, nbytes in self._sizes.values())
+                + sum(nbytes for _, _, nbytes in self._streamed.values()))
+
+    def _evict(self, keep):
+        """Drop least recently used datasets, then streamed values, until the resident size fits the budget
+
+        keep is the symbol or (symbol, name) streamed key that was just used and is never dropped.
+        """
+        while self._resident_bytes() > self.max_bytes:
+            symbol = next((symbol for symbol in self._stores if symbol != keep), None)
+            if symbol is not None:
+                store = self._stores.pop(symbol)
+                self._sizes.pop(symbol, None)
+                # Keep evicted stores' counters so the totals stay cumulative
+                for counter in self._retired:
+                    self._retired[counter] += store.stats()[counter]
+            else:
+                key = next((key for key in self._streamed if key != keep), None)
+                if key is None:
+                    break
+                del self._streamed[key]
+            self.evictions += 1
+
+    def stats(self):
+        """Return registry size, resident memory and aggregated store counters"""
+        with self._lock:
+            stores = list(self._stores.values())
+            resident = list(self._stores)
+            resident_bytes = self._resident_bytes()
+            retired = dict(self._retired)
+            streamed = sorted({symbol for symbol, _ in self._streamed})
+        counters = [store.stats() for store in stores]
+        return {
+            'data_dir': self.data_dir,
+            'symbols': len(self._index),
+            'resident': resident,
+            'resident_bytes': resident_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'streamed': streamed,
+            'hits': retired['hits'] + sum(c['hits'] for c in counters),
+            'misses': retired['misses'] + sum(c['misses'] for c in counters),
+            'reloads': retired['reloads'] + sum(c['reloads'] for c in counters),
+            'appends': retired['appends'] + sum(c['appends'] for c in counters),
+            'rejected': retired['rejected'] + sum(c['rejected'] for c in counters),
+            'coalesced': retired['coalesced'] + sum(c['coalesced'] for c in counters),
+        }
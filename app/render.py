@@ -0,0 +1,122 @@
+import io
+import threading
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from process_pool import ProcessPool
+from timing import stage
+
+
+def draw_period_bars(fig, periods, title, ylabel):
+    """Draw one bar chart panel per period side by side"""
+    axes = fig.subplots(1, len(periods), squeeze=False)[0]
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
+    for ax, period in zip(axes, periods):
+        ax.bar(period['years'], period['values'], color=period['color'], alpha=0.8)
+        ax.set_title(f"{period['title']}\n({period['years_label']})", fontweight='bold')
+        ax.set_xlabel('Year')
+        ax.set_ylabel(ylabel)
+        ax.tick_params(axis='x', rotation=45)
+        ax.grid(axis='y', alpha=0.3)
+
+
+def draw_period_lines(fig, periods, title, ylabel):
+    """Overlay one line per period on a single axis for comparison"""
+    ax = fig.subplots()
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
+    for period in periods:
+        ax.plot(period['years'], period['values'], marker=period['marker'],
+                linewidth=2.5, markersize=8, label=f"{period['label']} ({period['years_label']})",
+                color=period['color'])
+
+    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    ax.legend(loc='best', fontsize=11)
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', rotation=45)
+
+
+def draw_daily_lines(fig, periods, title, ylabel):
+    """Draw a downsampled daily series as one line segment per period on a date axis"""
+    ax = fig.subplots()
+    fig.suptitle(title, fontsize=14, fontweight='bold')
+
+    # x values are days since the epoch, which matplotlib date axes use natively
+    for period in periods:
+        ax.plot(period['x'], period['y'], linewidth=1, label=period['label'], color=period['color'])
+
+    ax.xaxis_date()
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    if periods:
+        ax.legend(loc='best', fontsize=10)
+    ax.grid(True, alpha=0.3)
+
+
+def draw_daily_candles(fig, periods, title, ylabel):
+    """Draw bucketed OHLC bars as candlesticks, colored by period, with one call per primitive"""
+    ax = fig.subplots()
+    fig.suptitle(title, fontsize=14, fontweight='bold')
+
+    for period in periods:
+        x, open_, close = period['x'], period['open'], period['close']
+        bottom = [min(o, c) for o, c in zip(open_, close)]
+        height = [abs(c - o) for o, c in zip(open_, close)]
+        # Hollow bodies for rising bars, filled bodies for falling bars
+        faces = ['white' if c >= o else period['color'] for o, c in zip(open_, close)]
+        ax.vlines(x, period['low'], period['high'], color=period['color'], linewidth=0.8)
+        ax.bar(x, height, bottom=bottom, width=period['width'], color=faces,
+               edgecolor=period['color'], linewidth=0.8, label=period['label'])
+
+    ax.xaxis_date()
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    if periods:
+        ax.legend(loc='best', fontsize=10)
+    ax.grid(True, alpha=0.3)
+
+
+# Chart kinds: drawing function, figure size, title and y-axis label
+CHART_KINDS = {
+    'volume': (draw_period_bars, (16, 5), 'Average Yearly Trading Volume by Period', 'Average Volume'),
+    'open': (draw_period_lines, (14, 7), 'Yearly Average Opening Price Trends by Period', 'Average Opening Price ($)'),
+    'close': (draw_period_lines, (14, 7), 'Yearly Average Closing Price Trends by Period', 'Average Closing Price ($)'),
+    'daily_line': (draw_daily_lines, (12, 5), 'Daily Series by Period', 'Value'),
+    'daily_ohlc': (draw_daily_candles, (12, 5), 'Daily Price by Period', 'Price ($)'),
+}
+
+
+def render_png(kind, periods, dpi=100, figsize=None, title=None, ylabel=None):
+    """Render a chart to PNG bytes using a private Figure/Agg canvas (no pyplot global state)
+
+    figsize, title and ylabel override the defaults registered for the chart kind.
+    """
+    draw, default_figsize, default_title, default_ylabel = CHART_KINDS[kind]
+    with stage('figure_render'):
+        fig = Figure(figsize=figsize or default_figsize)
+        FigureCanvasAgg(fig)
+        draw(fig, periods, title or default_title, ylabel or default_ylabel)
+        fig.tight_layout()
+
+    # savefig rasterizes the figure on the Agg canvas and then encodes the PNG
+    with stage('png_encode'):
+        img = io.BytesIO()
+        fig.savefig(img, format='png', dpi=dpi, bbox_inches='tight')
+        return img.getvalue()
+
+
+class RenderPool(ProcessPool):
+    """Render charts inline or on a bounded pool of worker processes"""
+
+    def __init__(self, max_workers=0):
+        super().__init__(max_workers)
+        # Bound in-flight jobs so a burst of requests queues here rather than in the pool
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) * 2)
+
+    def render(self, kind, periods, dpi=100, **options):
+        """Render a chart to PNG bytes, in a worker process when the pool is enabled"""
+        if self.max_workers <= 0:
+            return render_png(kind, periods, dpi, **options)
+        with self._slots:
+            return self._get_executor().submit(render_png, kind, periods, dpi, **options).result()
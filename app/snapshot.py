@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from compact import compact_frame
+from timing import stage
+
+# Columns stored in the snapshot. Date is written as int64 epoch days; prices and Volume
+# keep the dtypes compact_frame chose, and loading widens them again when GS_COMPACT=0
+SNAPSHOT_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def read_csv_frame(file_path, names=None):
+    """Load a Kaggle-style OHLCV CSV, drop OpenInt, and parse the Date column
+
+    Pass names to parse headerless CSV text, such as rows appended to a file.
+    """
+    # Load the CSV file into a pandas dataframe
+    with stage('csv_load'):
+        df = pd.read_csv(file_path, header=None if names else 'infer', names=names)
+
+    # Drop the OpenInt column
+    df = df.drop('OpenInt', axis=1)
+
+    # Convert Date column to datetime
+    with stage('datetime_parse'):
+        df['Date'] = pd.to_datetime(df['Date'])
+
+    return df
+
+
+def snapshot_dir(file_path):
+    """Directory holding the columnar snapshot for a CSV file (gs.us.txt -> gs.us.snapshot)"""
+    base, _ = os.path.splitext(file_path)
+    return base + '.snapshot'
+
+
+def _source_version(file_path):
+    """Return the (mtime_ns, size) of the source CSV as stored in the snapshot metadata"""
+    stat = os.stat(file_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def build_snapshot(file_path):
+    """Convert a CSV file into a directory of typed .npy column files"""
+    df = compact_frame(read_csv_frame(file_path))
+    out_dir = snapshot_dir(file_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Store dates as days since the epoch so they load without any parsing
+    epoch_days = df['Date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    np.save(os.path.join(out_dir, 'Date.npy'), epoch_days)
+    for column in SNAPSHOT_COLUMNS:
+        if column != 'Date':
+            np.save(os.path.join(out_dir, f'{column}.npy'), df[column].to_numpy())
+
+    # Metadata is written last so a half-written snapshot is never considered valid
+    meta = {'source': _source_version(file_path), 'rows': len(df), 'columns': list(SNAPSHOT_COLUMNS)}
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    return out_dir
+
+
+def load_snapshot(file_path):
+    """Load the snapshot for a CSV file, or return None if it is missing or stale"""
+    out_dir = snapshot_dir(file_path)
+    try:
+        with open(os.path.join(out_dir, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('source') != _source_version(file_path):
+        return None
+
+    # Memory-map the column files so only the pages we touch are read
+    with stage('snapshot_load'):
+        columns = {}
+        for column in SNAPSHOT_COLUMNS:
+            try:
+                columns[column] = np.load(os.path.join(out_dir, f'{column}.npy'), mmap_mode='r')
+            except (OSError, ValueError):
+                return None
+        columns['Date'] = columns['Date'].astype('datetime64[D]').astype('datetime64[ns]')
+        return pd.DataFrame(columns, copy=False)
+
+
+def load_frame(file_path):
+    """Load a dataset from its columnar snapshot, falling back to the CSV when stale"""
+    df = load_snapshot(file_path)
+    if df is None:
+        df = read_csv_frame(file_path)
+    return df
+
+
+if __name__ == '__main__':
+    # Usage: python app/snapshot.py [path/to/file.us.txt ...]
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for path in sys.argv[1:] or [os.path.join(parent_dir, 'gs.us.txt')]:
+        print(f'{path} -> {build_snapshot(path)}')
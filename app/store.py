@@ -0,0 +1,240 @@
+import io
+import os
+import threading
+
+import pandas as pd
+
+from compact import compact_frame, match_dtypes, year_codes
+from periods import PERIODS
+from singleflight import SingleFlight
+from snapshot import load_frame, read_csv_frame
+from timing import stage
+
+
+def read_dataset(file_path, periods=PERIODS):
+    """Read a Kaggle-style OHLCV file into compact columns tagged with period and year codes"""
+    # Load from the columnar snapshot when it is fresh, otherwise parse the CSV
+    df = compact_frame(load_frame(file_path))
+
+    # One vectorized pass assigns each row to a configured period instead of copying slices
+    with stage('slicing'):
+        df['Period'] = periods.assign(df['Date'])
+        df['Year'] = year_codes(df['Date'])
+    return df
+
+
+def append_dataset(df, raw, names, periods=PERIODS):
+    """Parse CSV rows appended to a dataset file and return (combined frame, new rows)
+
+    Raises ValueError when the new rows are not strictly after the existing ones,
+    in which case the caller rejects them and keeps the loaded data.
+    """
+    new_rows = match_dtypes(read_csv_frame(io.BytesIO(raw), names=names), df)
+    new_rows['Date'] = new_rows['Date'].astype(df['Date'].dtype)
+
+    # Appended dates must be strictly increasing and later than everything already loaded
+    dates = new_rows['Date']
+    if not dates.is_monotonic_increasing or dates.duplicated().any():
+        raise ValueError('Appended rows are not in strictly increasing date order')
+    if len(df) and dates.iloc[0] <= df['Date'].iloc[-1]:
+        raise ValueError('Appended rows overlap the loaded date range')
+
+    new_rows['Period'] = periods.assign(dates)
+    new_rows['Year'] = year_codes(dates)
+    new_rows.index = pd.RangeIndex(len(df), len(df) + len(new_rows))
+    return pd.concat([df, new_rows]), new_rows
+
+
+class DatasetStore:
+    """Process-wide cache of a dataset file that reloads only when the file changes"""
+
+    # Bytes before the end of the consumed data used to detect a rewritten file
+    FINGERPRINT_BYTES = 256
+
+    def __init__(self, file_path, loader=read_dataset, appender=append_dataset):
+        self.file_path = file_path
+        self.loader = loader
+        self.appender = appender
+        self._lock = threading.Lock()
+        self._entry = None
+        self._derived = {}
+        self._tail = None
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.appends = 0
+        self.rejected = 0
+
+    def _file_version(self):
+        """Return an (mtime_ns, size) tuple identifying the current file contents"""
+        stat = os.stat(self.file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def version(self):
+        """Version of the data currently held in memory, or None before the first load"""
+        entry = self._entry
+        return entry[0] if entry else None
+
+    @property
+    def data(self):
+        """Data currently held in memory without checking the file, or None before the first load"""
+        entry = self._entry
+        return entry[1] if entry else None
+
+    def get(self):
+        """Return the cached data, loading or reloading it if the file has changed"""
+        return self.get_entry()[1]
+
+    def get_entry(self):
+        """Return a (version, data) pair, loading or reloading the data if the file has changed"""
+        version = self._file_version()
+
+        # Fast path: the file is unchanged since the last load
+        entry = self._entry
+        if entry is not None and entry[0] == version:
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        with self._lock:
+            # Another thread may have finished the load while we waited for the lock
+            version = self._file_version()
+            entry = self._entry
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry
+
+            # Rows appended to the end of an unchanged prefix are parsed on their own
+            if entry is not None:
+                appended = self._try_append(entry, version)
+                if appended is not None:
+                    self.appends += appended > 0
+                    return self._entry
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+
+            self._entry = (version, self.loader(self.file_path))
+            self._derived = {}
+            self._tail = self._read_tail_state(version[1])
+            return self._entry
+
+    def _read_tail_state(self, offset):
+        """Remember the header, consumed byte offset and a fingerprint of the bytes before it"""
+        if self.appender is None:
+            return None
+        with open(self.file_path, 'rb') as f:
+            names = f.readline().decode().strip().split(',')
+            start = max(offset - self.FINGERPRINT_BYTES, 0)
+            f.seek(start)
+            fingerprint = f.read(offset - start)
+        # Only resume from a line boundary; a partial last line forces a full reload later
+        if not fingerprint.endswith(b'\n'):
+            return None
+        return {'names': names, 'offset': offset, 'fingerprint': fingerprint}
+
+    def _try_append(self, entry, version):
+        """Apply rows appended since the last load and return how many were added
+
+        Returns None when the file was truncated or rewritten and needs a full reload.
+        Rows that fail validation are skipped past and counted in rejected, never reloaded.
+        """
+        tail = self._tail
+        if tail is None or version[1] <= tail['offset']:
+            return None
+
+        with open(self.file_path, 'rb') as f:
+            # The bytes we already consumed must be unchanged, otherwise the file was rewritten
+            start = tail['offset'] - len(tail['fingerprint'])
+            f.seek(start)
+            if f.read(len(tail['fingerprint'])) != tail['fingerprint']:
+                return None
+            raw = f.read(version[1] - tail['offset'])
+
+        # Only consume complete lines; a partially written row is picked up next time
+        end = raw.rfind(b'\n') + 1
+        if end == 0:
+            self._entry = (version, entry[1])
+            self._derived = {name: (version, value) for name, (_, value) in self._derived.items()}
+            return 0
+        raw = raw[:end]
+        offset = tail['offset'] + end
+        fingerprint = (tail['fingerprint'] + raw)[-self.FINGERPRINT_BYTES:]
+
+        try:
+            data, new_rows = self.appender(entry[1], raw, tail['names'])
+        except ValueError:
+            # Keep the loaded data and move past the invalid rows so they are not parsed again
+            self.rejected += 1
+            self._tail = dict(tail, offset=offset, fingerprint=fingerprint)
+            self._entry = (version, entry[1])
+            self._derived = {name: (version, value) for name, (_, value) in self._derived.items()}
+            return 0
+
+        # Extend derived values that support it and drop the rest so they rebuild lazily
+        derived = {}
+        for name, (_, value) in self._derived.items():
+            if hasattr(value, 'extend'):
+                derived[name] = (version, value.extend(new_rows))
+
+        self._tail = dict(tail, offset=offset, fingerprint=fingerprint)
+        self._entry = (version, data)
+        self._derived = derived
+        return len(new_rows)
+
+    def derived(self, name, build):
+        """Return build(data) memoized for the current data version, rebuilt after a reload
+
+        Concurrent callers that miss the cache for the same version wait for a single build.
+        """
+        version, data = self.get_entry()
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        def build_and_keep():
+            # A build for this version may have finished between the lookup and joining the flight
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            value = build(data)
+            with self._lock:
+                # Only keep the result if no reload happened while it was being built
+                if self._entry is not None and self._entry[0] == version:
+                    self._derived[name] = (version, value)
+            return value
+
+        return self._flights.do((name, version), build_and_keep)
+
+    def derived_values(self):
+        """Return the derived values cached for the current data version, by name"""
+        with self._lock:
+            version = self.version
+            return {name: value for name, (built, value) in self._derived.items() if built == version}
+
+    def clear(self):
+        """Drop the cached data so the next access reloads it from disk"""
+        with self._lock:
+            self._entry = None
+            self._derived = {}
+            self._tail = None
+
+    def stats(self):
+        """Return cache counters and the current data version"""
+        with self._lock:
+            version = self.version
+            return {
+                'file': self.file_path,
+                'loaded': self._entry is not None,
+                'version': list(version) if version else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'appends': self.appends,
+                'rejected': self.rejected,
+                'coalesced': self._flights.shared,
+            }
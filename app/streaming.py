@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from compact import year_codes
+from cube import AggregateCube, build_monthly, rollup
+from periods import PERIODS
+from timing import stage
+
+# Rows parsed per chunk; peak memory follows this, the longest month and the cube size, not the file size
+CHUNK_ROWS = int(os.environ.get('GS_STREAM_ROWS', 500_000))
+
+
+def iter_chunks(file_path, chunk_rows=CHUNK_ROWS):
+    """Yield a Kaggle-style OHLCV CSV as parsed frames of at most chunk_rows rows"""
+    with pd.read_csv(file_path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk = chunk.drop('OpenInt', axis=1)
+            chunk['Date'] = pd.to_datetime(chunk['Date'])
+            yield chunk
+
+
+def tag_periods(chunks, periods=PERIODS):
+    """Add the Period and Year codes read_dataset assigns to every chunk"""
+    for chunk in chunks:
+        chunk['Period'] = periods.assign(chunk['Date'])
+        chunk['Year'] = year_codes(chunk['Date'])
+        yield chunk
+
+
+def whole_months(chunks):
+    """Re-cut date-ordered chunks so that no calendar month is split across two of them
+
+    The rows of the last month in a chunk are held back as pieces and joined once that
+    month ends, so each cube cell is aggregated from all of its rows in one groupby,
+    exactly as in the in-memory path, and no row is copied more than once. A month
+    longer than a chunk is held whole, so memory is bounded by the larger of the chunk
+    and the longest month.
+    """
+    held, held_month = [], None
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        dates = chunk['Date'].dt
+        months = (dates.year * 12 + dates.month).to_numpy()
+        earlier = np.flatnonzero(months != months[-1])
+        cut = earlier[-1] + 1 if len(earlier) else 0
+        if cut:
+            yield pd.concat(held + [chunk.iloc[:cut]]) if held else chunk.iloc[:cut]
+            held = []
+        elif held and months[-1] != held_month:
+            yield pd.concat(held)
+            held = []
+        held.append(chunk.iloc[cut:])
+        held_month = months[-1]
+    if held:
+        yield pd.concat(held)
+
+
+@stage('stream_aggregate')
+def stream_cube(file_path, periods=PERIODS, chunk_rows=CHUNK_ROWS):
+    """Build the aggregate cube of a CSV file in one pass over chunks, never holding the whole file
+
+    Each chunk is reduced to its period x year x month cells, which are the partial
+    aggregates merged across chunks. Cells only repeat if the file is not in date order;
+    they are then rolled up (means become sum / count) instead of concatenated.
+    """
+    partials = [build_monthly(chunk) for chunk in whole_months(tag_periods(iter_chunks(file_path, chunk_rows), periods))]
+    if not partials:
+        raise ValueError(f'{file_path} has no rows')
+    cells = pd.concat(partials)
+    if cells.index.has_duplicates:
+        cells = rollup(cells, ['Period', 'Year', 'Month'])
+    elif not cells.index.is_monotonic_increasing:
+        cells = cells.sort_index()
+    return AggregateCube(cells)
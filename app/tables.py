@@ -0,0 +1,55 @@
+from html import escape
+
+import pandas as pd
+
+from compact import expand_frame
+from timing import stage
+
+TABLE_CLASSES = 'table table-striped table-sm'
+
+
+def parse_date(value):
+    """Parse an optional YYYY-MM-DD query value into a Timestamp (None when empty)"""
+    if not value:
+        return None
+    return pd.Timestamp(value)
+
+
+def filter_date_range(df, start=None, end=None):
+    """Return the rows of a date-sorted frame with start <= Date <= end, without a boolean mask"""
+    with stage('slicing'):
+        dates = df['Date']
+        lo = dates.searchsorted(start, side='left') if start is not None else 0
+        hi = dates.searchsorted(end, side='right') if end is not None else len(df)
+        return df.iloc[lo:hi]
+
+
+def paginate(df, page, page_size):
+    """Return (rows, page, page_count) for a 1-based page number, clamped to the valid range"""
+    page_count = max((len(df) + page_size - 1) // page_size, 1)
+    page = min(max(page, 1), page_count)
+    offset = (page - 1) * page_size
+    return df.iloc[offset:offset + page_size], page, page_count
+
+
+def format_cell(value):
+    """Format a single table cell the way the HTML tables display it"""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    return escape(str(value))
+
+
+def iter_table_html(df, columns=None, chunk_rows=500):
+    """Yield an HTML table in chunks of rows so it never exists as one large string"""
+    columns = list(df.columns) if columns is None else columns
+    header = ''.join(f'<th>{escape(str(column))}</th>' for column in columns)
+    yield f'<table class="{TABLE_CLASSES}"><thead><tr>{header}</tr></thead><tbody>\n'
+
+    for offset in range(0, len(df), chunk_rows):
+        chunk = expand_frame(df.iloc[offset:offset + chunk_rows][columns])
+        yield ''.join(
+            '<tr>' + ''.join(f'<td>{format_cell(value)}</td>' for value in row) + '</tr>\n'
+            for row in chunk.itertuples(index=False, name=None)
+        )
+
+    yield '</tbody></table>\n'
@@ -0,0 +1,61 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from metrics import METRICS
+
+# Stage timings of the code running on this thread, when a recorder is active
+_local = threading.local()
+
+
+def record(name, seconds, allocated=None):
+    """Add seconds to a named stage of the active recorder, if any, and to the stage histograms"""
+    timings = getattr(_local, 'timings', None)
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+    labels = (('stage', name),)
+    METRICS.observe('gs_stage_seconds', labels, seconds)
+    if allocated is not None:
+        METRICS.observe('gs_stage_allocated_bytes', labels, allocated)
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as one named stage (csv_load, groupby, png_encode, ...)
+
+    Stages nest: a stage records only its own time, without that of the stages run
+    inside it, so the stages of a request add up to at most its total time. While
+    tracemalloc is tracing, the net growth in traced memory is recorded the same way.
+    """
+    tracing = tracemalloc.is_tracing()
+    before = tracemalloc.get_traced_memory()[0] if tracing else 0
+    # [seconds, bytes] spent in the stages nested directly inside this one
+    parent = getattr(_local, 'children', None)
+    _local.children = children = [0.0, 0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        allocated = max(tracemalloc.get_traced_memory()[0] - before, 0) if tracing else 0
+        _local.children = parent
+        if parent is not None:
+            parent[0] += seconds
+            parent[1] += allocated
+        record(name, max(seconds - children[0], 0.0), max(allocated - children[1], 0) if tracing else None)
+
+
+@contextmanager
+def recording():
+    """Collect the stage timings of the enclosed code on this thread into a dict
+
+    Stages that run more than once are summed; recorders nest, with the inner one
+    taking the timings while it is active.
+    """
+    previous = getattr(_local, 'timings', None)
+    _local.timings = timings = {}
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
@@ -0,0 +1,115 @@
+import os
+import queue
+import threading
+import time
+
+
+class WarmupScheduler:
+    """Precompute datasets, aggregates and charts in the background at start-up and after data changes
+
+    tasks is a list of (name, warm) pairs; warm(symbol) computes and caches one artifact.
+    A monitor thread polls each symbol's file version and queues every task for a symbol
+    whose file is new or has changed. Tasks run on a pool of daemon worker threads, and
+    requests for the same artifacts coalesce onto them through the caches' single-flight.
+    """
+
+    def __init__(self, registry, symbols, tasks, max_workers=2, interval=5.0):
+        self.registry = registry
+        self.symbols = [symbol.lower() for symbol in symbols]
+        self.tasks = tasks
+        self.max_workers = max(max_workers, 1)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._progress = {}
+
+    def start(self):
+        """Start the monitor and worker threads; returns self"""
+        with self._lock:
+            if self._threads:
+                return self
+            self._stop.clear()
+            self._threads = [threading.Thread(target=self._monitor, name='warmup-monitor', daemon=True)]
+            self._threads += [threading.Thread(target=self._work, name=f'warmup-{i}', daemon=True)
+                              for i in range(self.max_workers)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop the threads once their current tasks finish"""
+        self._stop.set()
+        for _ in range(self.max_workers):
+            self._queue.put(None)
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    def _file_version(self, symbol):
+        """(mtime_ns, size) of a symbol's file, or None when it is not indexed or readable"""
+        info = self.registry.info(symbol)
+        try:
+            stat = os.stat(info['path'])
+        except (TypeError, OSError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self):
+        """Queue a warm-up for every symbol whose file version differs from the last one queued"""
+        for symbol in self.symbols:
+            version = self._file_version(symbol)
+            with self._lock:
+                progress = self._progress.get(symbol)
+                if version is None or (progress is not None and progress['version'] == version):
+                    continue
+                self._progress[symbol] = {
+                    'version': version, 'state': 'warming', 'total': len(self.tasks), 'done': 0,
+                    'failed': 0, 'errors': [], 'started': time.time(), 'seconds': None,
+                }
+            for name, warm in self.tasks:
+                self._queue.put((symbol, version, name, warm))
+
+    def _monitor(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None or self._stop.is_set():
+                return
+            symbol, version, name, warm = job
+            with self._lock:
+                # Skip tasks queued for a version that has since been replaced
+                if self._progress[symbol]['version'] != version:
+                    continue
+            error = None
+            try:
+                warm(symbol)
+            except Exception as e:
+                error = f'{name}: {e!r}'
+            with self._lock:
+                progress = self._progress[symbol]
+                if progress['version'] != version:
+                    continue
+                progress['done'] += 1
+                if error:
+                    progress['failed'] += 1
+                    progress['errors'].append(error)
+                if progress['done'] == progress['total']:
+                    progress['state'] = 'ready' if not progress['failed'] else 'failed'
+                    progress['seconds'] = time.time() - progress['started']
+
+    def status(self):
+        """Return readiness and per-symbol warm-up progress"""
+        with self._lock:
+            symbols = {symbol: dict(progress, version=list(progress['version']), errors=list(progress['errors']))
+                       for symbol, progress in self._progress.items()}
+        # Finished means every task ran, even if some failed; unknown symbols are ignored
+        ready = all(symbols.get(symbol, {}).get('state') in ('ready', 'failed')
+                    for symbol in self.symbols if symbol in self.registry)
+        return {'ready': ready, 'running': bool(self._threads), 'queued': self._queue.qsize(), 'symbols': symbols}
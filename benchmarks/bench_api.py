@@ -0,0 +1,58 @@
+"""Range-lookup latency of the DateIndex versus a boolean-mask scan as the series grows
+
+For each series length the same k-row window is selected both ways. The
+searchsorted path should stay roughly flat (O(log n + k)) while the mask scan
+grows linearly with n.
+
+Usage: python benchmarks/bench_api.py [--window K] [--sizes 1e4,1e5,1e6,2.5e6]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+
+from ohlcv import DateIndex, select  # noqa: E402
+
+
+def synthetic_frame(n_rows):
+    """Build an n-row daily OHLCV frame with strictly increasing dates"""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_rows))
+    return pd.DataFrame({
+        'Date': pd.Timestamp('1970-01-01') + pd.to_timedelta(np.arange(n_rows), unit='D'),
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+        'Volume': rng.integers(1_000, 1_000_000, n_rows),
+    })
+
+
+def best_ms(fn, number=20):
+    """Best-of-5 average latency of fn in milliseconds"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--window', type=int, default=250)
+    parser.add_argument('--sizes', default='1e4,1e5,1e6,2.5e6')
+    args = parser.parse_args()
+
+    print(f'{"rows":>10} {"index ms":>10} {"mask ms":>10}')
+    for n_rows in (int(float(size)) for size in args.sizes.split(',')):
+        df = synthetic_frame(n_rows)
+        index = DateIndex(df['Date'])
+        mid = n_rows // 2
+        start, end = df['Date'].iloc[mid], df['Date'].iloc[mid + args.window - 1]
+
+        indexed = best_ms(lambda: select(df, index, start, end, ['Close', 'Volume']))
+        masked = best_ms(lambda: df[(df['Date'] >= start) & (df['Date'] <= end)][['Date', 'Close', 'Volume']])
+        print(f'{n_rows:>10} {indexed:>10.3f} {masked:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
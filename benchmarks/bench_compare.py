@@ -0,0 +1,91 @@
+"""Speedup of the multi-ticker comparison as worker processes are added
+
+Writes synthetic peer files (gs.us.txt prices with their own random drift and volume,
+--scale times the rows over the same date span) and runs the comparison behind
+/api/compare for every worker count: loading each ticker through ComparePool, then
+aligning them and computing the cross-sectional statistics. Every result must match
+the inline (0 workers) run exactly.
+
+Usage: python benchmarks/bench_compare.py [--tickers 16] [--scale 20] [--workers 0,1,2,4]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+
+from compare import ComparePool, compare  # noqa: E402
+
+
+def peer_files(data_dir, n_tickers, scale, source=os.path.join(ROOT, 'gs.us.txt')):
+    """Write (or reuse) n_tickers synthetic peers of the source file and return their paths"""
+    base = pd.read_csv(source, parse_dates=['Date'])
+    source_ns = base['Date'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    n_rows = len(base) * scale
+    dates_ns = np.linspace(source_ns[0], source_ns[-1], n_rows).astype(np.int64)
+    dates = pd.to_datetime(dates_ns).strftime('%Y-%m-%d %H:%M:%S')
+
+    paths = []
+    for i in range(n_tickers):
+        path = os.path.join(data_dir, f'peer{i}x{scale}.us.txt')
+        paths.append(path)
+        if os.path.exists(path):
+            continue
+        rng = np.random.default_rng(i)
+        # Shared gs.us.txt moves plus a random walk of the ticker's own
+        drift = np.exp(np.cumsum(rng.normal(0, 0.01 / np.sqrt(scale), n_rows)))
+        frame = {'Date': dates}
+        for column in ('Open', 'High', 'Low', 'Close'):
+            frame[column] = np.round(np.interp(dates_ns, source_ns, base[column].to_numpy()) * drift, 3)
+        volume = np.interp(dates_ns, source_ns, base['Volume'].to_numpy()) / scale
+        frame['Volume'] = np.maximum(volume * rng.lognormal(0, 0.5, n_rows), 1).astype(np.int64)
+        frame['OpenInt'] = 0
+        pd.DataFrame(frame).to_csv(path, index=False)
+    return paths
+
+
+def run(pool, symbols, paths):
+    """Load and compare the tickers once; returns (seconds, result)"""
+    start = time.perf_counter()
+    result = compare(symbols, pool.load(paths))
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=16)
+    parser.add_argument('--scale', type=int, default=20)
+    parser.add_argument('--workers', default=','.join(str(n) for n in [0, 1, 2, 4, 8] if n <= (os.cpu_count() or 1)))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'gs-bench-compare'))
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    paths = peer_files(args.data_dir, args.tickers, args.scale)
+    symbols = [os.path.basename(path).split('.')[0] for path in paths]
+    print(f'{args.tickers} tickers x {os.path.getsize(paths[0]) / 2**20:.1f} MB, {os.cpu_count()} CPUs\n')
+
+    print(f'{"workers":>8} {"seconds":>9} {"speedup":>8}')
+    reference = inline = None
+    for workers in [int(n) for n in args.workers.split(',')]:
+        pool = ComparePool(max_workers=workers)
+        # The first run starts the worker processes and is not timed
+        run(pool, symbols, paths)
+        seconds, result = min((run(pool, symbols, paths) for _ in range(args.repeat)), key=lambda r: r[0])
+        pool.shutdown()
+
+        if reference is None:
+            reference, inline = json.dumps(result), seconds
+        assert json.dumps(result) == reference, f'{workers} workers changed the comparison'
+        print(f'{workers:>8} {seconds:>9.2f} {inline / seconds:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
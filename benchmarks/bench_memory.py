@@ -0,0 +1,91 @@
+"""Peak RSS per request with and without the compact dataset representation
+
+Every route runs in a fresh interpreter against a scaled synthetic copy of
+gs.us.txt (see bench_routes.py), once with GS_COMPACT=0 (float64/int64
+columns) and once with the default compact columns. The reported peak is
+the growth of the RSS high-water mark (Linux VmHWM) during a request: the
+cold request includes loading the dataset and building what the route needs,
+the warm one repeats it against the loaded data.
+
+With --snapshot the dataset is loaded from a columnar snapshot written in
+each mode's dtypes, which memory-maps the compact columns without parsing.
+
+Usage: python benchmarks/bench_memory.py [--scale N] [--snapshot]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_routes import synthetic_file  # noqa: E402
+
+ROUTES = ['/', '/volume-analysis', '/volume-analysis.png', '/api/ohlcv?start=2010-01-01&end=2010-12-31',
+          '/api/aggregates?level=monthly', '/indicators', '/daily-chart.png?method=ohlc']
+
+CHILD = """
+import json, re, sys
+sys.path.insert(0, {app_dir!r})
+import data
+if {snapshot!r}:
+    # Rebuild the snapshot in this process's column dtypes before anything is measured
+    import snapshot
+    snapshot.build_snapshot(data.symbol_registry.info({symbol!r})['path'])
+
+def status_mb(field):
+    return int(re.search(field + r':\\s+(\\d+)', open('/proc/self/status').read()).group(1)) / 1024
+
+def peak_growth(client, url):
+    # Writing 5 to clear_refs resets the high-water mark (VmHWM) to the current RSS
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    before = status_mb('VmRSS')
+    response = client.get(url)
+    assert response.status_code == 200, response.status_code
+    return status_mb('VmHWM') - before
+
+client = data.app.test_client()
+cold = peak_growth(client, {url!r})
+warm = peak_growth(client, {url!r})
+print(json.dumps({{'cold_mb': cold, 'warm_mb': warm, 'dataset_mb': data.symbol_registry.stats()['resident_bytes'] / 2**20}}))
+"""
+
+
+def measure(url, symbol, data_dir, compact, snapshot):
+    """Run a cold and a warm request in a fresh interpreter and return their peak RSS growth"""
+    env = dict(os.environ, GS_DATA_DIR=data_dir, GS_WARMUP='0', GS_COMPACT='1' if compact else '0')
+    code = CHILD.format(app_dir=os.path.join(ROOT, 'app'), url=url, symbol=symbol, snapshot=snapshot)
+    out = subprocess.run([sys.executable, '-c', code], env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--snapshot', action='store_true', help='load from a columnar snapshot instead of the CSV')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'gs-bench-routes'))
+    args = parser.parse_args()
+
+    data_dir = os.path.join(args.data_dir, f'x{args.scale}')
+    os.makedirs(data_dir, exist_ok=True)
+    _, n_rows = synthetic_file(data_dir, args.scale)
+    print(f'{n_rows:,} rows ({args.scale}x gs.us.txt)\n')
+
+    print(f'{"":<45} {"cold request MB":>21} {"warm request MB":>21}')
+    print(f'{"route":<45} {"before":>10} {"after":>10} {"before":>10} {"after":>10}')
+    for route in ROUTES:
+        symbol = f'x{args.scale}'
+        url = route + ('&' if '?' in route else '?') + f'symbol={symbol}'
+        before = measure(url, symbol, data_dir, compact=False, snapshot=args.snapshot)
+        after = measure(url, symbol, data_dir, compact=True, snapshot=args.snapshot)
+        print(f'{route:<45} {before["cold_mb"]:>10.1f} {after["cold_mb"]:>10.1f} '
+              f'{before["warm_mb"]:>10.1f} {after["warm_mb"]:>10.1f}')
+    print(f'\nresident dataset: {before["dataset_mb"]:.1f} MB before, {after["dataset_mb"]:.1f} MB after')
+
+
+if __name__ == '__main__':
+    main()
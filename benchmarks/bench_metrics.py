@@ -0,0 +1,79 @@
+"""Overhead of the stage timers and request metrics when profiling is off
+
+Measures the per-call cost of a stage() timer against a bare block, then the
+warm latency of several routes with the metrics registry enabled and disabled.
+The estimated overhead is stage timers per request times their cost, as a
+share of the request latency; ?profile=1 is timed separately for reference.
+
+Usage: python benchmarks/bench_metrics.py [--requests N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+# Measure cold paths ourselves instead of racing the background warm-up
+os.environ.setdefault('GS_WARMUP', '0')
+
+import data  # noqa: E402
+from metrics import METRICS  # noqa: E402
+from timing import recording, stage  # noqa: E402
+
+ROUTES = ['/', '/volume-analysis', '/volume-analysis.png', '/api/ohlcv?start=2017-01-01',
+          '/api/aggregates', '/api/downsample']
+
+
+def per_call_ns(statement, number=200_000):
+    """Best-of-5 cost of a statement in nanoseconds"""
+    timer = timeit.Timer(statement, globals={'stage': stage})
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def median_ms(client, route, n_requests):
+    """Median warm latency of a route in milliseconds"""
+    samples = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        response = client.get(route)
+        response.data
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, (route, response.status_code)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    bare = per_call_ns('pass')
+    timed = per_call_ns("with stage('bench'):\n    pass")
+    stage_ns = timed - bare
+    print(f'stage() timer: {stage_ns:.0f} ns per call')
+
+    client = data.app.test_client()
+    print(f'\n{"route":<30} {"stages":>6} {"off ms":>8} {"on ms":>8} {"est. overhead":>14} {"profile ms":>11}')
+    for route in ROUTES:
+        # Warm the dataset and chart caches, and count the stage timers one request runs
+        client.get(route)
+        with recording() as stages:
+            client.get(route)
+
+        METRICS.enabled = False
+        off = median_ms(client, route, args.requests)
+        METRICS.enabled = True
+        on = median_ms(client, route, args.requests)
+        separator = '&' if '?' in route else '?'
+        profiled = median_ms(client, route + separator + 'profile=1', max(args.requests // 20, 3))
+
+        # Stage timers plus the request hook's own histogram updates
+        estimate = (len(stages) + 2) * stage_ns / 1e6 / on
+        print(f'{route:<30} {len(stages):>6} {off:>8.3f} {on:>8.3f} {estimate:>13.3%} {profiled:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
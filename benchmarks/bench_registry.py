@@ -0,0 +1,86 @@
+"""Memory of the symbol registry as the number of tickers grows
+
+Writes N synthetic *.us.txt files (date-contiguous slices of gs.us.txt), then walks
+a SymbolRegistry with a small --cache-mb budget through every symbol, loading its
+dataset and aggregate cube as the analysis routes do. resident_bytes must never
+exceed the budget, and process RSS must stay flat once the LRU is full: its growth
+from the first quarter of the walk to the end has to stay under --tolerance-mb.
+
+Usage: python benchmarks/bench_registry.py [--tickers 3000] [--rows 1000] [--cache-mb 16]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+
+from cube import build_cube  # noqa: E402
+from registry import SymbolRegistry  # noqa: E402
+
+
+def rss_mb():
+    """Current resident set size of this process in MB"""
+    with open('/proc/self/status') as f:
+        return int(re.search(r'VmRSS:\s+(\d+)', f.read()).group(1)) / 1024
+
+
+def ticker_files(data_dir, n_tickers, n_rows, source=os.path.join(ROOT, 'gs.us.txt')):
+    """Write (or reuse) n_tickers files, each a random n_rows-line slice of the source"""
+    with open(source) as f:
+        header, *lines = f.readlines()
+    rng = np.random.default_rng(0)
+    for i in range(n_tickers):
+        path = os.path.join(data_dir, f't{i:05d}.us.txt')
+        if os.path.exists(path):
+            continue
+        start = rng.integers(0, len(lines) - n_rows)
+        with open(path, 'w') as f:
+            f.write(header)
+            f.writelines(lines[start:start + n_rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=3000)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--cache-mb', type=int, default=16)
+    parser.add_argument('--tolerance-mb', type=float, default=32)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'gs-bench-registry'))
+    args = parser.parse_args()
+
+    data_dir = os.path.join(args.data_dir, f'{args.tickers}x{args.rows}')
+    os.makedirs(data_dir, exist_ok=True)
+    ticker_files(data_dir, args.tickers, args.rows)
+
+    start = time.perf_counter()
+    registry = SymbolRegistry(data_dir, max_bytes=args.cache_mb * 1024 * 1024)
+    symbols = registry.symbols()
+    print(f'indexed {len(symbols):,} files in {time.perf_counter() - start:.2f} s, RSS {rss_mb():.0f} MB\n')
+
+    print(f'{"loaded":>8} {"resident":>9} {"resident MB":>12} {"RSS MB":>8}')
+    samples = []
+    step = max(len(symbols) // 20, 1)
+    for i, symbol in enumerate(symbols, 1):
+        registry.get(symbol)
+        registry.derived(symbol, 'cube', build_cube)
+        stats = registry.stats()
+        assert stats['resident_bytes'] <= registry.max_bytes, f'over budget after {symbol}'
+        if i % step == 0 or i == len(symbols):
+            samples.append((i, rss_mb()))
+            print(f'{i:>8,} {len(stats["resident"]):>9,} {stats["resident_bytes"] / 2**20:>12.1f} {samples[-1][1]:>8.0f}')
+
+    # Compare against RSS a quarter of the way in, once the LRU has filled
+    quarter = next(rss for i, rss in samples if i >= len(symbols) // 4)
+    growth = samples[-1][1] - quarter
+    print(f'\nRSS growth over the last three quarters: {growth:+.1f} MB (evictions: {registry.evictions:,})')
+    assert growth < args.tolerance_mb, f'RSS grew {growth:.1f} MB, more than {args.tolerance_mb} MB'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Load test for the chart routes across render worker counts
+
+Sends concurrent requests to the volume, opening price and closing price chart
+routes through the Flask test client. Every request asks for a distinct ?dpi=,
+so neither the chart cache nor its single-flight coalescing can skip a render:
+each one draws and encodes a PNG through the RenderPool. The inline run
+(0 workers) is the reference every pooled image is checked against byte for
+byte. Throughput is reported per worker count, and on a machine with more than
+one CPU the best pooled run must beat the inline one by --min-speedup.
+
+Usage: python benchmarks/bench_render.py [--requests N] [--workers 0,1,2,4] [--min-speedup 1.2]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+# Measure cold paths ourselves instead of racing the background warm-up
+os.environ.setdefault('GS_WARMUP', '0')
+
+import data  # noqa: E402
+from chart_cache import ChartCache  # noqa: E402
+from render import RenderPool  # noqa: E402
+
+ROUTES = ['/volume-analysis.png', '/price-analysis.png', '/close-analysis.png']
+# Requests use dpi MIN_DPI, MIN_DPI + 1, ...; the warm-up uses MAX_DPI, which they never reach
+MIN_DPI, MAX_DPI = 50, 300
+
+
+def fetch(url):
+    """Request one chart image and return (url, PNG bytes)"""
+    response = data.app.test_client().get(url)
+    assert response.status_code == 200, (url, response.status_code)
+    return url, response.data
+
+
+def run(workers, urls):
+    """Request every URL concurrently from empty chart caches; returns (renders per second, images)"""
+    data.render_pool = RenderPool(max_workers=workers)
+    data.chart_cache = ChartCache(max_bytes=1 << 30)
+
+    # Start the worker processes and build the aggregate cube outside the timed part
+    for route in ROUTES:
+        fetch(f'{route}?dpi={MAX_DPI}')
+
+    threads = max(workers, 1) * 2
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        images = dict(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+    data.render_pool.shutdown()
+    return len(urls) / elapsed, images
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=48)
+    parser.add_argument('--workers', default='0,1,2,4')
+    parser.add_argument('--min-speedup', type=float, default=1.2)
+    args = parser.parse_args()
+    if not 0 < args.requests < MAX_DPI - MIN_DPI:
+        parser.error(f'--requests must be between 1 and {MAX_DPI - MIN_DPI - 1}')
+
+    urls = [f'{ROUTES[i % len(ROUTES)]}?dpi={MIN_DPI + i}' for i in range(args.requests)]
+
+    print(f'{"workers":>8} {"renders/s":>10} {"speedup":>8}')
+    inline_rate, reference = run(0, urls)
+    print(f'{0:>8} {inline_rate:>10.2f} {1:>7.2f}x')
+    best = None
+    for workers in (int(w) for w in args.workers.split(',') if int(w) > 0):
+        rate, images = run(workers, urls)
+        for url, body in images.items():
+            assert body == reference[url], f'{url} differs from the inline render'
+        best = max(best or 0, rate / inline_rate)
+        print(f'{workers:>8} {rate:>10.2f} {rate / inline_rate:>7.2f}x')
+
+    if best is None:
+        return
+    if (os.cpu_count() or 1) > 1:
+        assert best >= args.min_speedup, f'best speedup {best:.2f}x is below {args.min_speedup}x'
+        print(f'\nbest speedup {best:.2f}x over the inline run')
+    else:
+        print('\nsingle CPU: speedup not checked')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""Per-stage latency of every Flask route on scaled synthetic datasets, with a regression diff
+
+Each GET route is requested through the Flask test client (no network) on
+synthetic OHLCV files of 10x, 100x and 1000x the rows of gs.us.txt. A cold
+request starts from an empty dataset registry and chart cache, so it pays for
+the CSV load, datetime parse, slicing, groupby and chart render; warm requests
+repeat it against the caches. Stages exclude the stages nested inside them, so
+they never overlap; time spent outside every stage is reported as other, next to
+the stages the app records itself (html_build included).
+
+Results are written as JSON. --baseline compares the new run against an older
+results file, and --diff compares two files without running anything; both
+exit with status 1 when a route got slower than the threshold allows.
+
+Usage: python benchmarks/bench_routes.py [--scales 10,100,1000] [--repeat N] [--output FILE]
+       python benchmarks/bench_routes.py --baseline old.json [--threshold 0.2]
+       python benchmarks/bench_routes.py --diff old.json new.json [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+# Measure cold paths ourselves instead of racing the background warm-up
+os.environ.setdefault('GS_WARMUP', '0')
+
+import data  # noqa: E402
+from chart_cache import ChartCache  # noqa: E402
+from registry import SymbolRegistry, read_date_range  # noqa: E402
+from timing import recording  # noqa: E402
+
+# Query strings for routes whose defaults would dump the whole dataset; one year is a typical request
+ROUTE_QUERIES = {
+    '/api/ohlcv': 'start=2010-01-01&end=2010-12-31',
+    '/api/indicators': 'start=2010-01-01&end=2010-12-31',
+}
+
+
+def synthetic_file(data_dir, scale, source=os.path.join(ROOT, 'gs.us.txt')):
+    """Write (or reuse) a dataset with scale times the rows of the source over the same date span
+
+    Timestamps are spread evenly between the first and last source dates, so the periods
+    and years match gs.us.txt, and prices are interpolated from it with a little noise.
+    """
+    path = os.path.join(data_dir, f'x{scale}.us.txt')
+    base = pd.read_csv(source, parse_dates=['Date'])
+    n_rows = len(base) * scale
+    if os.path.exists(path):
+        # Reuse a file only if it has the rows and the date span this function writes
+        span = tuple(date[:10] for date in read_date_range(path))
+        with open(path, 'rb') as f:
+            if sum(1 for _ in f) - 1 == n_rows and span == read_date_range(source):
+                return path, n_rows
+
+    rng = np.random.default_rng(scale)
+    source_ns = base['Date'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    dates_ns = np.linspace(source_ns[0], source_ns[-1], n_rows).astype(np.int64)
+    frame = {'Date': pd.to_datetime(dates_ns).strftime('%Y-%m-%d %H:%M:%S')}
+    for column in ('Open', 'High', 'Low', 'Close'):
+        values = np.interp(dates_ns, source_ns, base[column].to_numpy())
+        frame[column] = np.round(values * (1 + rng.normal(0, 0.001, n_rows)), 3)
+    volume = np.interp(dates_ns, source_ns, base['Volume'].to_numpy()) / scale
+    frame['Volume'] = np.maximum(volume, 1).astype(np.int64)
+    frame['OpenInt'] = 0
+    pd.DataFrame(frame).to_csv(path, index=False)
+    return path, n_rows
+
+
+def get_routes():
+    """Every parameterless GET route of the app (static files excluded)"""
+    routes = []
+    for rule in data.app.url_map.iter_rules():
+        if 'GET' in rule.methods and not rule.arguments:
+            routes.append(rule.rule)
+    return sorted(routes)
+
+
+def timed_get(client, url):
+    """Request a URL and return its total and per-stage latency in milliseconds"""
+    with recording() as stages:
+        start = time.perf_counter()
+        response = client.get(url)
+        body = response.data
+        total = time.perf_counter() - start
+    assert response.status_code == 200, (url, response.status_code, body[:200])
+
+    stages = {name: seconds * 1000 for name, seconds in stages.items()}
+    # Time outside every stage (routing, the test client, untimed code) is reported on its own
+    stages['other'] = max(total * 1000 - sum(stages.values()), 0.0)
+    return {'total_ms': total * 1000, 'stages': stages}
+
+
+def median_timing(samples):
+    """Stage-by-stage median of several timings"""
+    names = sorted({name for sample in samples for name in sample['stages']})
+    return {
+        'total_ms': statistics.median(sample['total_ms'] for sample in samples),
+        'stages': {name: statistics.median(sample['stages'].get(name, 0.0) for sample in samples)
+                   for name in names},
+    }
+
+
+def bench_route(data_dir, url, repeat):
+    """Time one cold request from empty caches, then the median of repeated warm requests"""
+    data.symbol_registry = SymbolRegistry(data_dir, max_bytes=1 << 40)
+    data.chart_cache = ChartCache(max_bytes=1 << 30)
+    client = data.app.test_client()
+    cold = timed_get(client, url)
+    warm = median_timing([timed_get(client, url) for _ in range(repeat)])
+    return {'cold': cold, 'warm': warm}
+
+
+def run(scales, repeat, data_dir):
+    """Benchmark every route at every scale and return the results document"""
+    os.makedirs(data_dir, exist_ok=True)
+    results = {}
+    for scale in scales:
+        # One dataset per directory so each registry scan sees only the file under test
+        scale_dir = os.path.join(data_dir, f'x{scale}')
+        os.makedirs(scale_dir, exist_ok=True)
+        _, n_rows = synthetic_file(scale_dir, scale)
+        print(f'\nscale {scale}x: {n_rows:,} rows')
+        print(f'{"route":<22} {"cold ms":>10} {"warm ms":>10}  slowest cold stages')
+
+        routes = {}
+        for route in get_routes():
+            query = '&'.join(filter(None, [f'symbol=x{scale}', ROUTE_QUERIES.get(route)]))
+            routes[route] = timing = bench_route(scale_dir, f'{route}?{query}', repeat)
+            slowest = sorted(timing['cold']['stages'].items(), key=lambda item: -item[1])[:3]
+            summary = ', '.join(f'{name} {ms:.1f}' for name, ms in slowest)
+            print(f'{route:<22} {timing["cold"]["total_ms"]:>10.1f} {timing["warm"]["total_ms"]:>10.1f}  {summary}')
+        results[str(scale)] = {'rows': n_rows, 'routes': routes}
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(old, new, threshold, min_ms):
+    """Print total latency changes between two results documents and return the regressions
+
+    A route regresses when it is more than threshold (a fraction) and min_ms slower.
+    """
+    regressions = []
+    print(f'\n{"scale":>6} {"route":<22} {"phase":<5} {"old ms":>10} {"new ms":>10} {"change":>8}')
+    for scale, scale_results in new['results'].items():
+        old_routes = old['results'].get(scale, {}).get('routes', {})
+        for route, timing in scale_results['routes'].items():
+            if route not in old_routes:
+                continue
+            for phase in ('cold', 'warm'):
+                before = old_routes[route][phase]
+                after = timing[phase]
+                change = after['total_ms'] / before['total_ms'] - 1 if before['total_ms'] else 0.0
+                flag = ''
+                if change > threshold and after['total_ms'] - before['total_ms'] > min_ms:
+                    # Name the stage that grew the most
+                    stages = set(before['stages']) | set(after['stages'])
+                    worst = max(stages, key=lambda name: after['stages'].get(name, 0.0) - before['stages'].get(name, 0.0))
+                    flag = f'  REGRESSION ({worst})'
+                    regressions.append((scale, route, phase, change, worst))
+                print(f'{scale:>6} {route:<22} {phase:<5} {before["total_ms"]:>10.1f} '
+                      f'{after["total_ms"]:>10.1f} {change:>+7.1%}{flag}')
+    print(f'\n{len(regressions)} regression(s) above {threshold:.0%}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='10,100,1000')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'gs-bench-routes'))
+    parser.add_argument('--output', default=os.path.join(ROOT, 'bench_routes.json'))
+    parser.add_argument('--baseline', help='results file to compare this run against')
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'), help='compare two results files and exit')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown as a fraction')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='ignore slowdowns smaller than this')
+    args = parser.parse_args()
+
+    if args.diff:
+        with open(args.diff[0]) as f:
+            old = json.load(f)
+        with open(args.diff[1]) as f:
+            new = json.load(f)
+        sys.exit(1 if compare(old, new, args.threshold, args.min_ms) else 0)
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    new = run(scales, args.repeat, args.data_dir)
+    with open(args.output, 'w') as f:
+        json.dump(new, f, indent=2)
+    print(f'\nresults written to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            old = json.load(f)
+        sys.exit(1 if compare(old, new, args.threshold, args.min_ms) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Compare cold-start latency and peak RSS of the CSV and snapshot load paths
+
+Each measurement runs in a fresh interpreter so imports, page cache effects
+of the previous run and pandas' internal caches do not leak between paths.
+The CSV is copied to a temporary directory and the snapshot is built there, so
+the snapshot served next to the live data is never rewritten.
+
+Usage: python benchmarks/bench_snapshot.py [path/to/file.us.txt] [--runs N]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, 'app')
+
+CHILD = """
+import resource, sys, time, json
+sys.path.insert(0, {app_dir!r})
+import snapshot
+start = time.perf_counter()
+df = snapshot.{func}({path!r})
+assert df is not None, 'snapshot missing or stale'
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'rows': len(df), 'max_rss_mb': rss_kb / 1024}}))
+"""
+
+
+def measure(func, path, runs):
+    """Run one load path in fresh interpreters and return the best timing and RSS"""
+    results = []
+    for _ in range(runs):
+        code = CHILD.format(app_dir=APP_DIR, func=func, path=path)
+        out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+        results.append(json.loads(out.stdout))
+    best = min(results, key=lambda r: r['seconds'])
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', default=os.path.join(ROOT, 'gs.us.txt'))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, APP_DIR)
+    import snapshot
+    with tempfile.TemporaryDirectory() as tmp:
+        path = shutil.copy2(args.path, tmp)
+        snapshot.build_snapshot(path)
+
+        print(f'{"path":<10} {"rows":>10} {"load ms":>10} {"max RSS MB":>12}')
+        for label, func in (('csv', 'read_csv_frame'), ('snapshot', 'load_snapshot')):
+            r = measure(func, path, args.runs)
+            print(f'{label:<10} {r["rows"]:>10} {r["seconds"] * 1000:>10.2f} {r["max_rss_mb"]:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
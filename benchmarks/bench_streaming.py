@@ -0,0 +1,127 @@
+"""Peak memory of chunked CSV aggregation on a file larger than a worker's memory
+
+Writes a synthetic multi-GB OHLCV file over the gs.us.txt date span (in chunks, so
+writing it never holds the whole file either), then builds the aggregate cube with
+stream_cube in a fresh interpreter for each chunk size and reports time, throughput
+and peak RSS growth. The cubes from every chunk size must be identical. The streamed
+cube of a smaller bench_routes file (--verify-scale) is also compared against the
+in-memory path, read_dataset + build_cube, with its peak alongside.
+
+Usage: python benchmarks/bench_streaming.py [--gb 2] [--chunk-rows 100000,500000,2000000] [--verify-scale 1000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_routes import synthetic_file  # noqa: E402
+
+# Rows generated per write; about 60 bytes each once formatted
+WRITE_ROWS = 1_000_000
+
+CHILD = """
+import hashlib, json, re, sys, time
+sys.path.insert(0, {app_dir!r})
+import pandas as pd
+from cube import build_cube
+from store import read_dataset
+from streaming import stream_cube
+
+def status_mb(field):
+    return int(re.search(field + r':\\s+(\\d+)', open('/proc/self/status').read()).group(1)) / 1024
+
+def digest(cube):
+    h = hashlib.sha256()
+    for cells in (cube.monthly, cube.yearly, cube.periods):
+        cells = cells.reset_index()
+        h.update(str(list(cells.dtypes)).encode())
+        h.update(pd.util.hash_pandas_object(cells, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+# Writing 5 to clear_refs resets the high-water mark (VmHWM) to the current RSS
+with open('/proc/self/clear_refs', 'w') as f:
+    f.write('5')
+before = status_mb('VmRSS')
+start = time.perf_counter()
+if {chunk_rows!r}:
+    cube = stream_cube({path!r}, chunk_rows={chunk_rows!r})
+else:
+    cube = build_cube(read_dataset({path!r}))
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'peak_mb': status_mb('VmHWM') - before, 'digest': digest(cube)}}))
+"""
+
+
+def large_file(data_dir, gb, source=os.path.join(ROOT, 'gs.us.txt')):
+    """Write (or reuse) a synthetic OHLCV file of about gb gigabytes and return (path, rows)"""
+    path = os.path.join(data_dir, f'stream{gb:g}g.us.txt')
+    n_rows = int(gb * 2**30 / 60)
+    if os.path.exists(path) and os.path.getsize(path) > 0.9 * gb * 2**30:
+        return path, n_rows
+
+    base = pd.read_csv(source, parse_dates=['Date'])
+    source_ns = base['Date'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    rng = np.random.default_rng(0)
+    with open(path, 'w') as f:
+        for lo in range(0, n_rows, WRITE_ROWS):
+            positions = np.arange(lo, min(lo + WRITE_ROWS, n_rows))
+            dates_ns = source_ns[0] + ((source_ns[-1] - source_ns[0]) * (positions / (n_rows - 1))).astype(np.int64)
+            frame = {'Date': pd.to_datetime(dates_ns).strftime('%Y-%m-%d %H:%M:%S')}
+            for column in ('Open', 'High', 'Low', 'Close'):
+                values = np.interp(dates_ns, source_ns, base[column].to_numpy())
+                frame[column] = np.round(values * (1 + rng.normal(0, 0.001, len(positions))), 3)
+            frame['Volume'] = rng.integers(1, 10_000, len(positions))
+            frame['OpenInt'] = 0
+            pd.DataFrame(frame).to_csv(f, index=False, header=lo == 0)
+    return path, n_rows
+
+
+def measure(path, chunk_rows):
+    """Build the cube of path in a fresh interpreter, streamed when chunk_rows is set"""
+    code = CHILD.format(app_dir=os.path.join(ROOT, 'app'), path=path, chunk_rows=chunk_rows)
+    env = dict(os.environ, GS_WARMUP='0')
+    out = subprocess.run([sys.executable, '-c', code], env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--gb', type=float, default=2)
+    parser.add_argument('--chunk-rows', default='100000,500000,2000000')
+    parser.add_argument('--verify-scale', type=int, default=1000)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'gs-bench-routes'))
+    args = parser.parse_args()
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    path, n_rows = synthetic_file(args.data_dir, args.verify_scale)
+    memory = measure(path, None)
+    streamed = measure(path, 500_000)
+    print(f'{n_rows:,} rows ({args.verify_scale}x gs.us.txt, {os.path.getsize(path) / 2**20:.0f} MB)')
+    print(f'  in-memory: {memory["seconds"]:.1f} s, peak {memory["peak_mb"]:.0f} MB')
+    print(f'  streamed:  {streamed["seconds"]:.1f} s, peak {streamed["peak_mb"]:.0f} MB')
+    assert streamed['digest'] == memory['digest'], 'streamed cube differs from the in-memory cube'
+    print('  cubes identical\n')
+
+    path, n_rows = large_file(args.data_dir, args.gb)
+    print(f'{n_rows:,} rows ({os.path.getsize(path) / 2**30:.1f} GB)')
+    print(f'{"chunk rows":>12} {"seconds":>9} {"rows/s":>12} {"peak MB":>9}')
+    digests = set()
+    for chunk_rows in [int(rows) for rows in args.chunk_rows.split(',')]:
+        result = measure(path, chunk_rows)
+        digests.add(result['digest'])
+        print(f'{chunk_rows:>12,} {result["seconds"]:>9.1f} {n_rows / result["seconds"]:>12,.0f} '
+              f'{result["peak_mb"]:>9.0f}')
+    assert len(digests) == 1, 'cubes differ between chunk sizes'
+    print('cubes identical across chunk sizes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Check the aggregate cube against per-period groupby('Year') results
+
+Recomputes every yearly statistic the way the routes did before the cube existed:
+slice each period's rows by date, add a Year column and run groupby('Year') on the
+raw float64/int64 columns. Each period x column x stat must match cube.yearly
+(and the whole-period aggregate must match cube.periods) to rtol 1e-12.
+
+Usage: python benchmarks/check_cube.py [--file path/to/ticker.us.txt]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+
+from cube import CUBE_STATS, build_cube  # noqa: E402
+from ohlcv import OHLCV_COLUMNS  # noqa: E402
+from periods import PERIODS  # noqa: E402
+from snapshot import read_csv_frame  # noqa: E402
+from store import read_dataset  # noqa: E402
+
+RTOL = 1e-12
+
+
+def period_frame(df, code):
+    """Rows of one period selected with date masks, as the per-period copies used to be"""
+    start, end = PERIODS.bounds(code)
+    mask = pd.Series(True, index=df.index)
+    if start:
+        mask &= df['Date'] >= start
+    if end:
+        mask &= df['Date'] <= end
+    frame = df[mask].copy()
+    frame['Year'] = frame['Date'].dt.year
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=os.path.join(ROOT, 'gs.us.txt'))
+    args = parser.parse_args()
+
+    cube = build_cube(read_dataset(args.file))
+    raw = read_csv_frame(args.file)
+
+    checked = 0
+    for code, period in enumerate(PERIODS):
+        frame = period_frame(raw, code)
+        for column in OHLCV_COLUMNS:
+            for stat in CUBE_STATS:
+                expected = frame.groupby('Year')[column].agg(stat)
+                actual = cube.series(code, column, stat)
+                assert list(actual.index) == list(expected.index), (period['label'], column, stat)
+                assert np.allclose(actual.to_numpy(dtype=float), expected.to_numpy(dtype=float), rtol=RTOL, atol=0), \
+                    (period['label'], column, stat)
+                if len(frame):
+                    # groupby on a constant key gives first/last the same meaning as above
+                    overall = float(frame.groupby(np.zeros(len(frame)))[column].agg(stat).iloc[0])
+                    assert np.isclose(cube.period_stat(code, column, stat), overall, rtol=RTOL, atol=0), \
+                        (period['label'], column, stat, 'period')
+                checked += 1
+        print(f'{period["label"]:<25} {len(frame):>6,} rows  {frame["Year"].nunique():>3} years  ok')
+    print(f'\n{checked} period x column x stat series match groupby(\'Year\') to rtol {RTOL:g}')
+
+
+if __name__ == '__main__':
+    main()